@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+from collections.abc import Mapping
 
 import click
 
@@ -40,8 +42,9 @@ async def _areas(ctx: Context, mapping_file: str | None, create_missing: bool) -
         print_info(f"Loaded mapping with {len(name_to_area)} entries")
 
     async with ctx.client() as client:
-        trees = await fetch_span_trees(client)
-        existing_areas = await fetch_areas(client)
+        trees, existing_areas = await asyncio.gather(
+            fetch_span_trees(client), fetch_areas(client),
+        )
 
         if not trees:
             print_warn("No SPAN devices found")
@@ -125,7 +128,7 @@ class _AssignAction:
 def _plan_assignments(
     trees: list,
     name_to_area: dict[str, str | None],
-    area_by_name: dict[str, HAArea],
+    area_by_name: Mapping[str, HAArea],
 ) -> list[_AssignAction]:
     """Plan area assignments for all circuit devices."""
     actions: list[_AssignAction] = []
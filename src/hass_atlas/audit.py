@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
+import asyncio
+
 import click
 
 from hass_atlas.context import Context, pass_ctx, run_async
 from hass_atlas.energy import extract_energy_entity_ids
-from hass_atlas.output import console, print_info, print_ok, print_warn, render_json, render_table, render_tree
+from hass_atlas.output import (
+    console,
+    print_info,
+    print_ok,
+    print_warn,
+    render_json,
+    render_table,
+    render_tree,
+)
 from hass_atlas.registry import fetch_energy_prefs, fetch_span_trees
 
 
@@ -26,8 +36,9 @@ def audit(ctx: Context, output_format: str) -> None:
 
 async def _audit(ctx: Context, output_format: str) -> None:
     async with ctx.client() as client:
-        trees = await fetch_span_trees(client)
-        energy_prefs = await fetch_energy_prefs(client)
+        trees, energy_prefs = await asyncio.gather(
+            fetch_span_trees(client), fetch_energy_prefs(client),
+        )
 
     if not trees:
         print_warn("No SPAN devices found in Home Assistant")
@@ -9,7 +9,7 @@ import click
 from dotenv import load_dotenv
 
 from hass_atlas.context import Context
-from hass_atlas.discovery import discover_ha
+from hass_atlas.discovery import MDNSDiscoveryError, discover_ha
 from hass_atlas.ha_client import HAClientError
 from hass_atlas.output import print_error, print_info
 
@@ -49,12 +49,8 @@ class _ErrorHandlingGroup(click.Group):
     def invoke(self, ctx: click.Context) -> Any:
         try:
             return super().invoke(ctx)
-        except HAClientError as exc:
+        except (HAClientError, MDNSDiscoveryError) as exc:
             raise click.ClickException(str(exc)) from None
-        except RuntimeError as exc:
-            if "mDNS" in str(exc):
-                raise click.ClickException(str(exc)) from None
-            raise
 
 
 @click.group(cls=_ErrorHandlingGroup)
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import atexit
+import functools
 import time
 from dataclasses import dataclass
 
@@ -11,7 +13,11 @@ HA_SERVICE_TYPE = "_home-assistant._tcp.local."
 DEFAULT_TIMEOUT = 5.0
 
 
-@dataclass
+class MDNSDiscoveryError(RuntimeError):
+    """mDNS discovery could not be started."""
+
+
+@dataclass(slots=True, frozen=True)
 class HAInstance:
     """A discovered Home Assistant instance."""
 
@@ -19,18 +25,26 @@ class HAInstance:
     host: str
     ip: str
     port: int
+    url: str
     version: str | None = None
     location_name: str | None = None
     uuid: str | None = None
 
-    @property
-    def url(self) -> str:
-        return f"http://{self.ip}:{self.port}"
+
+def _txt_value(props: dict[bytes, bytes | None], key: bytes) -> str | None:
+    """Decode a single TXT record value, leaving the rest of the record untouched."""
+    value = props.get(key)
+    return value.decode("utf-8", "replace") if value is not None else None
 
 
 class _HAListener(ServiceListener):
     def __init__(self) -> None:
-        self.instances: list[HAInstance] = []
+        self._by_uuid: dict[str, HAInstance] = {}
+
+    @property
+    def instances(self) -> list[HAInstance]:
+        """Discovered instances, one per HA uuid (or host:port if no uuid)."""
+        return list(self._by_uuid.values())
 
     def add_service(self, zc: Zeroconf, type_: str, name: str) -> None:
         info = zc.get_service_info(type_, name)
@@ -39,16 +53,20 @@ class _HAListener(ServiceListener):
         addresses = info.parsed_addresses(IPVersion.V4Only)
         if not addresses:
             return
-        props = info.decoded_properties or {}
-        self.instances.append(HAInstance(
+        props = info.properties or {}
+        uuid = _txt_value(props, b"uuid")
+        port = info.port or 8123
+        key = uuid or f"{info.server}:{port}"
+        self._by_uuid[key] = HAInstance(
             name=name,
             host=info.server or "",
             ip=addresses[0],
-            port=info.port or 8123,
-            version=props.get("version"),
-            location_name=props.get("location_name"),
-            uuid=props.get("uuid"),
-        ))
+            port=port,
+            url=f"http://{addresses[0]}:{port}",
+            version=_txt_value(props, b"version"),
+            location_name=_txt_value(props, b"location_name"),
+            uuid=uuid,
+        )
 
     def remove_service(self, zc: Zeroconf, type_: str, name: str) -> None:
         pass
@@ -57,21 +75,32 @@ class _HAListener(ServiceListener):
         pass
 
 
+@functools.lru_cache(maxsize=1)
+def _shared_zc() -> Zeroconf:
+    """Process-wide Zeroconf instance, created on first use."""
+    try:
+        return Zeroconf(ip_version=IPVersion.V4Only)
+    except OSError as exc:
+        raise MDNSDiscoveryError(f"mDNS discovery failed: {exc}") from None
+
+
+@atexit.register
+def _close_shared_zc() -> None:
+    if _shared_zc.cache_info().currsize:
+        _shared_zc().close()
+        _shared_zc.cache_clear()
+
+
 def discover_ha(timeout: float = DEFAULT_TIMEOUT) -> list[HAInstance]:
     """Discover Home Assistant instances on the local network via mDNS.
 
     Browses for ``_home-assistant._tcp`` services for *timeout* seconds.
     Returns a list of discovered instances (may be empty).
     """
-    try:
-        zc = Zeroconf()
-    except OSError as exc:
-        raise RuntimeError(f"mDNS discovery failed: {exc}") from None
     listener = _HAListener()
-    browser = ServiceBrowser(zc, HA_SERVICE_TYPE, listener)
+    browser = ServiceBrowser(_shared_zc(), HA_SERVICE_TYPE, listener)
     try:
         time.sleep(timeout)
     finally:
         browser.cancel()
-        zc.close()
     return listener.instances
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-import copy
+import asyncio
+from collections import defaultdict
+from collections.abc import Iterator
+from itertools import chain
 from typing import Any
 
 import click
@@ -26,6 +29,7 @@ from hass_atlas.registry import (
     fetch_span_trees,
 )
 from hass_atlas.topology import (
+    EnergyRole,
     EnergyTopology,
     build_energy_topology,
     classify_circuits,
@@ -48,18 +52,19 @@ def energy(ctx: Context, topology: bool) -> None:
 
 async def _energy(ctx: Context) -> None:
     async with ctx.client() as client:
-        trees = await fetch_span_trees(client)
-        current_prefs = await fetch_energy_prefs(client)
+        trees, current_prefs = await asyncio.gather(
+            fetch_span_trees(client), fetch_energy_prefs(client),
+        )
 
     if not trees:
         print_warn("No SPAN devices found")
         return
 
     proposed = build_energy_config(trees)
-    merged = merge_prefs(current_prefs, proposed)
+    merged, added_sources, added_consumption = _merge_additions(current_prefs, proposed)
 
     # Show diff
-    _show_diff(current_prefs, merged)
+    _show_diff(added_sources, added_consumption)
 
     if ctx.dry_run:
         print_dry_run("Would save energy dashboard config (use without --dry-run to apply)")
@@ -74,9 +79,11 @@ async def _energy(ctx: Context) -> None:
 async def _energy_topology_config(ctx: Context) -> None:
     """Topology-aware energy dashboard configuration."""
     async with ctx.client() as client:
-        devices, entities, areas = await fetch_registries(client)
-        states = await fetch_entity_states(client)
-        current_prefs = await fetch_energy_prefs(client)
+        (devices, entities, areas), states, current_prefs = await asyncio.gather(
+            fetch_registries(client),
+            fetch_entity_states(client),
+            fetch_energy_prefs(client),
+        )
 
     # Enrich entities with device_class/state_class from states
     # (entity registry doesn't include these — they're runtime properties)
@@ -104,6 +111,14 @@ async def _energy_topology_config(ctx: Context) -> None:
     print_ok("Topology-aware energy dashboard config saved")
 
 
+_ENERGY_SUFFIXES = (
+    "lugs-upstream_imported-energy",
+    "lugs-upstream_exported-energy",
+    "imported-energy",
+    "exported-energy",
+)
+
+
 def _find_entity_by_property(device: HADevice, property_suffix: str) -> HAEntity | None:
     """Find an entity on a device whose unique_id ends with a given property name.
 
@@ -116,27 +131,45 @@ def _find_entity_by_property(device: HADevice, property_suffix: str) -> HAEntity
     return None
 
 
+def _index_energy_entities(device: HADevice) -> dict[str, HAEntity]:
+    """Map each suffix in ``_ENERGY_SUFFIXES`` to the device's first enabled entity ending with it.
+
+    Used for the panel, site metering and battery, where several suffixes are
+    read; single-suffix lookups use ``_find_entity_by_property``.
+    """
+    idx: dict[str, HAEntity] = {}
+    for entity in device.entities:
+        if entity.disabled_by:
+            continue
+        for suffix in _ENERGY_SUFFIXES:
+            if entity.unique_id.endswith(suffix):
+                idx.setdefault(suffix, entity)
+    return idx
+
+
 def build_energy_config(trees: list[SpanDeviceTree]) -> dict:
     """Build proposed energy dashboard config from SPAN device trees."""
     energy_sources: list[dict] = []
     device_consumption: list[dict] = []
 
     for tree in trees:
+        panel_idx = _index_energy_entities(tree.panel)
+        sm_idx = _index_energy_entities(tree.site_metering) if tree.site_metering else {}
+
         # Grid — upstream energy entities.
         # In production: live on panel device (node: lugs-upstream)
         # In some setups: live on site_metering child device
         # Fallback chain: panel lugs-upstream → site_metering → panel generic
-        imported = _find_entity_by_property(tree.panel, "lugs-upstream_imported-energy")
-        if not imported and tree.site_metering:
-            imported = _find_entity_by_property(tree.site_metering, "imported-energy")
-        if not imported:
-            imported = _find_entity_by_property(tree.panel, "imported-energy")
-
-        exported = _find_entity_by_property(tree.panel, "lugs-upstream_exported-energy")
-        if not exported and tree.site_metering:
-            exported = _find_entity_by_property(tree.site_metering, "exported-energy")
-        if not exported:
-            exported = _find_entity_by_property(tree.panel, "exported-energy")
+        imported = (
+            panel_idx.get("lugs-upstream_imported-energy")
+            or sm_idx.get("imported-energy")
+            or panel_idx.get("imported-energy")
+        )
+        exported = (
+            panel_idx.get("lugs-upstream_exported-energy")
+            or sm_idx.get("exported-energy")
+            or panel_idx.get("exported-energy")
+        )
 
         if imported or exported:
             grid_source: dict = {"type": "grid", "flow_from": [], "flow_to": []}
@@ -161,8 +194,9 @@ def build_energy_config(trees: list[SpanDeviceTree]) -> dict:
 
         # Battery
         if tree.battery:
-            discharge = _find_entity_by_property(tree.battery, "imported-energy")
-            charge = _find_entity_by_property(tree.battery, "exported-energy")
+            batt_idx = _index_energy_entities(tree.battery)
+            discharge = batt_idx.get("imported-energy")
+            charge = batt_idx.get("exported-energy")
             if discharge or charge:
                 batt_source: dict = {"type": "battery"}
                 if discharge:
@@ -189,78 +223,85 @@ def build_energy_config(trees: list[SpanDeviceTree]) -> dict:
 
 def merge_prefs(current: dict, proposed: dict) -> dict:
     """Merge proposed config into current, only adding missing entries."""
-    merged = copy.deepcopy(current)
+    return _merge_additions(current, proposed)[0]
+
+
+def _merge_additions(current: dict, proposed: dict) -> tuple[dict, list[dict], list[dict]]:
+    """Merge like ``merge_prefs``, also returning the sources and consumption entries added."""
+    added_sources: list[dict] = []
+    added_consumption: list[dict] = []
+
+    # Only the two lists we append to need copying; entries are shared, not mutated.
+    merged = {
+        **current,
+        "energy_sources": list(current.get("energy_sources", [])),
+        "device_consumption": list(current.get("device_consumption", [])),
+    }
 
     # Merge energy_sources — add sources not already present (by type + entity_id)
-    existing_sources = merged.get("energy_sources", [])
+    existing_sources = merged["energy_sources"]
     existing_source_keys = _source_keys(existing_sources)
     for source in proposed.get("energy_sources", []):
         key = _source_key(source)
         if key not in existing_source_keys:
             existing_sources.append(source)
+            added_sources.append(source)
             existing_source_keys.add(key)
-    merged["energy_sources"] = existing_sources
 
     # Merge device_consumption — add entries not already present
-    existing_consumption = merged.get("device_consumption", [])
+    existing_consumption = merged["device_consumption"]
     existing_stats = {d.get("stat_consumption") for d in existing_consumption}
     for entry in proposed.get("device_consumption", []):
         if entry.get("stat_consumption") not in existing_stats:
             existing_consumption.append(entry)
+            added_consumption.append(entry)
             existing_stats.add(entry.get("stat_consumption"))
-    merged["device_consumption"] = existing_consumption
 
-    return merged
+    return merged, added_sources, added_consumption
+
+
+SourceKey = tuple[Any, ...]
 
 
-def _source_key(source: dict) -> str:
-    """Generate a dedup key for an energy source."""
+def _source_key(source: dict) -> SourceKey:
+    """Generate a hashable dedup key for an energy source."""
     stype = source.get("type", "")
     if stype == "grid":
         from_ids = sorted(f.get("stat_energy_from", "") for f in source.get("flow_from", []))
         to_ids = sorted(f.get("stat_energy_to", "") for f in source.get("flow_to", []))
-        return f"grid:{','.join(from_ids)}:{','.join(to_ids)}"
+        return ("grid", tuple(from_ids), tuple(to_ids))
     elif stype == "solar":
-        return f"solar:{source.get('stat_energy_from', '')}"
+        return ("solar", source.get("stat_energy_from", ""))
     elif stype == "battery":
-        return f"battery:{source.get('stat_energy_from', '')}:{source.get('stat_energy_to', '')}"
-    return f"{stype}:{id(source)}"
+        return ("battery", source.get("stat_energy_from", ""), source.get("stat_energy_to", ""))
+    return (stype, id(source))
 
 
-def _source_keys(sources: list[dict]) -> set[str]:
+def _source_keys(sources: list[dict]) -> set[SourceKey]:
     return {_source_key(s) for s in sources}
 
 
-def _show_diff(current: dict, merged: dict) -> None:
-    """Show what would change."""
-    current_sources = current.get("energy_sources", [])
-    merged_sources = merged.get("energy_sources", [])
-    new_sources = len(merged_sources) - len(current_sources)
+def _format_source_key(key: SourceKey) -> str:
+    """Render a source key for display, e.g. ``grid:sensor.a,sensor.b:sensor.c``."""
+    return ":".join(",".join(part) if isinstance(part, tuple) else str(part) for part in key)
 
-    current_consumption = current.get("device_consumption", [])
-    merged_consumption = merged.get("device_consumption", [])
-    new_consumption = len(merged_consumption) - len(current_consumption)
 
+def _show_diff(added_sources: list[dict], added_consumption: list[dict]) -> None:
+    """Show what would change, given the entries ``_merge_additions`` added."""
     console.rule("[bold]Energy Dashboard Changes[/bold]")
 
-    if new_sources == 0 and new_consumption == 0:
+    if not added_sources and not added_consumption:
         print_ok("No changes needed — energy dashboard is up to date")
         return
 
-    if new_sources > 0:
-        print_info(f"Adding {new_sources} energy source(s):")
-        existing_keys = _source_keys(current_sources)
-        for source in merged_sources:
-            if _source_key(source) not in existing_keys:
-                _print_source(source)
-
-    if new_consumption > 0:
-        existing_stats = {d.get("stat_consumption") for d in current_consumption}
-        new_entries = [
-            e for e in merged_consumption if e.get("stat_consumption") not in existing_stats
-        ]
-        print_info(f"Adding {new_consumption} circuit consumption sensor(s):")
-        for entry in new_entries:
+    if added_sources:
+        print_info(f"Adding {len(added_sources)} energy source(s):")
+        for source in added_sources:
+            _print_source(source)
+
+    if added_consumption:
+        print_info(f"Adding {len(added_consumption)} circuit consumption sensor(s):")
+        for entry in added_consumption:
             console.print(f"  - {entry.get('stat_consumption')}")
 
 
@@ -304,23 +345,24 @@ def build_topology_aware_config(topo: EnergyTopology) -> dict:
     energy_sources: list[dict] = []
     device_consumption: list[dict] = []
 
-    # Collect preferred role assignments
-    preferred = [a for a in topo.role_assignments if a.preferred]
+    # Group preferred role assignments by role in one pass
+    by_role: defaultdict[str, list[EnergyRole]] = defaultdict(list)
+    for a in topo.role_assignments:
+        if a.preferred:
+            by_role[a.role].append(a)
 
     # Grid — aggregate import/export into one grid source
-    grid_imports = [a for a in preferred if a.role == "grid_import"]
-    grid_exports = [a for a in preferred if a.role == "grid_export"]
+    grid_imports = by_role["grid_import"]
+    grid_exports = by_role["grid_export"]
     if grid_imports or grid_exports:
-        grid_source: dict = {"type": "grid", "flow_from": [], "flow_to": []}
-        for a in grid_imports:
-            grid_source["flow_from"].append({"stat_energy_from": a.entity_id})
-        for a in grid_exports:
-            grid_source["flow_to"].append({"stat_energy_to": a.entity_id})
-        energy_sources.append(grid_source)
+        energy_sources.append({
+            "type": "grid",
+            "flow_from": [{"stat_energy_from": a.entity_id} for a in grid_imports],
+            "flow_to": [{"stat_energy_to": a.entity_id} for a in grid_exports],
+        })
 
     # Solar
-    solar_assignments = [a for a in preferred if a.role == "solar"]
-    for a in solar_assignments:
+    for a in by_role["solar"]:
         solar_source: dict = {
             "type": "solar",
             "stat_energy_from": a.entity_id,
@@ -330,8 +372,8 @@ def build_topology_aware_config(topo: EnergyTopology) -> dict:
         energy_sources.append(solar_source)
 
     # Battery — aggregate charge/discharge into one battery source
-    batt_discharge = [a for a in preferred if a.role == "battery_discharge"]
-    batt_charge = [a for a in preferred if a.role == "battery_charge"]
+    batt_discharge = by_role["battery_discharge"]
+    batt_charge = by_role["battery_charge"]
     if batt_discharge or batt_charge:
         batt_source: dict = {"type": "battery"}
         if batt_discharge:
@@ -348,8 +390,7 @@ def build_topology_aware_config(topo: EnergyTopology) -> dict:
         energy_sources.append(batt_source)
 
     # Device consumption
-    consumption_assignments = [a for a in preferred if a.role == "device_consumption"]
-    for a in consumption_assignments:
+    for a in by_role["device_consumption"]:
         entry: dict[str, str] = {"stat_consumption": a.entity_id}
         if a.parent_entity_id:
             entry["included_in_stat"] = a.parent_entity_id
@@ -373,26 +414,41 @@ def apply_topology_prefs(current: dict, topo: EnergyTopology) -> dict:
     (stat_cost, cost_adjustment_day, etc.), so existing source objects are
     preserved when their entity_ids match a preferred assignment.
     """
-    result = copy.deepcopy(current)
-
-    # Build sets from topology decisions
-    preferred = [a for a in topo.role_assignments if a.preferred]
-    skipped = [a for a in topo.role_assignments if not a.preferred]
-    skipped_eids = {a.entity_id for a in skipped}
-    wanted_consumption = {a.entity_id for a in preferred if a.role == "device_consumption"}
-    wanted_source_eids = {a.entity_id for a in preferred if a.role != "device_consumption"}
-
-    # Build consumption metadata mappings from topology
-    consumption_parents: dict[str, str] = {
-        a.entity_id: a.parent_entity_id
-        for a in preferred
-        if a.role == "device_consumption" and a.parent_entity_id
-    }
-    consumption_rates: dict[str, str] = {
-        a.entity_id: a.rate_entity_id
-        for a in preferred
-        if a.role == "device_consumption" and a.rate_entity_id
-    }
+    # No decisions to apply: every existing entry is user-configured and kept.
+    if not topo.role_assignments:
+        return {
+            **current,
+            "energy_sources": list(current.get("energy_sources", [])),
+            "device_consumption": list(current.get("device_consumption", [])),
+        }
+
+    # Shallow copy: the managed lists are rebuilt below and entries that need
+    # new values are replaced by merged copies, so ``current`` is never mutated.
+    result = dict(current)
+
+    # Build sets and consumption metadata (included_in_stat, stat_rate)
+    # from topology decisions in one pass
+    skipped_eids: set[str] = set()
+    wanted_consumption: set[str] = set()
+    wanted_source_eids: set[str] = set()
+    consumption_fields: dict[str, dict[str, str]] = {}
+    for a in topo.role_assignments:
+        if not a.preferred:
+            skipped_eids.add(a.entity_id)
+            continue
+        if a.role != "device_consumption":
+            wanted_source_eids.add(a.entity_id)
+            continue
+        wanted_consumption.add(a.entity_id)
+        fields: dict[str, str] = {}
+        if a.parent_entity_id:
+            fields["included_in_stat"] = a.parent_entity_id
+        if a.rate_entity_id:
+            fields["stat_rate"] = a.rate_entity_id
+        if fields:
+            # Merge per field so a later assignment for the same entity
+            # doesn't drop an earlier parent or rate it doesn't set.
+            consumption_fields.setdefault(a.entity_id, {}).update(fields)
 
     # --- Device consumption: keep wanted + non-SPAN user entries ---
     existing_consumption = result.get("device_consumption", [])
@@ -400,35 +456,25 @@ def apply_topology_prefs(current: dict, topo: EnergyTopology) -> dict:
     for entry in existing_consumption:
         stat = entry.get("stat_consumption", "")
         if stat in wanted_consumption:
-            updated = copy.deepcopy(entry)
-            if stat in consumption_parents:
-                updated["included_in_stat"] = consumption_parents[stat]
-            if stat in consumption_rates:
-                updated["stat_rate"] = consumption_rates[stat]
-            keep_consumption.append(updated)
+            keep_consumption.append(entry | consumption_fields.get(stat, {}))
             wanted_consumption.discard(stat)  # mark as already present
         elif stat not in skipped_eids:
             # Not in wanted or skipped — user-configured entry, preserve it
             keep_consumption.append(entry)
     # Add new entries not yet present
     for stat in sorted(wanted_consumption):
-        new_entry: dict[str, str] = {"stat_consumption": stat}
-        if stat in consumption_parents:
-            new_entry["included_in_stat"] = consumption_parents[stat]
-        if stat in consumption_rates:
-            new_entry["stat_rate"] = consumption_rates[stat]
-        keep_consumption.append(new_entry)
+        keep_consumption.append({"stat_consumption": stat} | consumption_fields.get(stat, {}))
     result["device_consumption"] = keep_consumption
 
     # --- Energy sources: filter + preserve existing objects ---
     existing_sources = result.get("energy_sources", [])
     keep_sources = []
-    matched_preferred_eids: set[str] = set()
+    matched_eid_sets: list[frozenset[str]] = []
 
     # Build proposed config to get updated stat_rate values
     proposed = build_topology_aware_config(topo)
     # Map source key → proposed stat_rate for updating existing sources
-    proposed_source_rates: dict[str, str | None] = {}
+    proposed_source_rates: dict[SourceKey, str | None] = {}
     for source in proposed.get("energy_sources", []):
         key = _source_key(source)
         proposed_source_rates[key] = source.get("stat_rate")
@@ -445,15 +491,15 @@ def apply_topology_prefs(current: dict, topo: EnergyTopology) -> dict:
             key = _source_key(source)
             new_rate = proposed_source_rates.get(key)
             if new_rate and source.get("stat_rate") != new_rate:
-                source = copy.deepcopy(source)
-                source["stat_rate"] = new_rate
+                source = source | {"stat_rate": new_rate}
             keep_sources.append(source)
-            matched_preferred_eids |= source_eids
+            matched_eid_sets.append(source_eids)
             continue
         # Source has entities not in wanted or skipped — user-configured, keep
         keep_sources.append(source)
 
     # Add new sources for preferred entities not already matched
+    matched_preferred_eids = set().union(*matched_eid_sets)
     for source in proposed.get("energy_sources", []):
         source_eids = _extract_source_entity_ids(source)
         if not (source_eids <= matched_preferred_eids):
@@ -464,7 +510,7 @@ def apply_topology_prefs(current: dict, topo: EnergyTopology) -> dict:
     return result
 
 
-def _extract_source_entity_ids(source: dict) -> set[str]:
+def _extract_source_entity_ids(source: dict) -> frozenset[str]:
     """Extract all entity_ids from an energy source dict."""
     eids: set[str] = set()
     for flow in source.get("flow_from", []):
@@ -477,7 +523,7 @@ def _extract_source_entity_ids(source: dict) -> set[str]:
         eids.add(eid)
     if eid := source.get("stat_energy_to"):
         eids.add(eid)
-    return eids
+    return frozenset(eids)
 
 
 def _show_topology_diff(current: dict, cleaned: dict) -> None:
@@ -489,51 +535,35 @@ def _show_topology_diff(current: dict, cleaned: dict) -> None:
     current_consumption = current.get("device_consumption", [])
     cleaned_consumption = cleaned.get("device_consumption", [])
 
-    current_consumption_ids = {d.get("stat_consumption") for d in current_consumption}
-    cleaned_consumption_ids = {d.get("stat_consumption") for d in cleaned_consumption}
-    current_source_eids = set()
-    for s in current_sources:
-        current_source_eids |= _extract_source_entity_ids(s)
-    cleaned_source_eids = set()
-    for s in cleaned_sources:
-        cleaned_source_eids |= _extract_source_entity_ids(s)
-
-    added_consumption = cleaned_consumption_ids - current_consumption_ids
-    removed_consumption = current_consumption_ids - cleaned_consumption_ids
+    current_consumption_map = {d.get("stat_consumption"): d for d in current_consumption}
+    cleaned_consumption_map = {d.get("stat_consumption"): d for d in cleaned_consumption}
+    current_source_eids = set().union(*map(_extract_source_entity_ids, current_sources))
+    cleaned_source_eids = set().union(*map(_extract_source_entity_ids, cleaned_sources))
+
+    added_consumption = cleaned_consumption_map.keys() - current_consumption_map.keys()
+    removed_consumption = current_consumption_map.keys() - cleaned_consumption_map.keys()
     added_source_eids = cleaned_source_eids - current_source_eids
     removed_source_eids = current_source_eids - cleaned_source_eids
 
     # Detect metadata updates on existing consumption entries (included_in_stat, stat_rate)
-    current_consumption_map = {d.get("stat_consumption"): d for d in current_consumption}
-    cleaned_consumption_map = {d.get("stat_consumption"): d for d in cleaned_consumption}
-    updated_consumption: dict[str, dict[str, tuple[str | None, str | None]]] = {}
-    for stat in current_consumption_ids & cleaned_consumption_ids:
-        old_entry = current_consumption_map[stat]
-        new_entry = cleaned_consumption_map[stat]
-        diffs: dict[str, tuple[str | None, str | None]] = {}
-        for field in ("included_in_stat", "stat_rate"):
-            old_val = old_entry.get(field)
-            new_val = new_entry.get(field)
-            if old_val != new_val:
-                diffs[field] = (old_val, new_val)
-        if diffs:
-            updated_consumption[stat] = diffs
+    updated_consumption = _diff_fields(
+        current_consumption_map, cleaned_consumption_map, ("included_in_stat", "stat_rate"),
+    )
 
     # Detect metadata updates on existing energy sources (stat_rate)
-    current_source_map = {_source_key(s): s for s in current_sources}
-    cleaned_source_map = {_source_key(s): s for s in cleaned_sources}
-    updated_sources: dict[str, dict[str, tuple[str | None, str | None]]] = {}
-    for key in set(current_source_map) & set(cleaned_source_map):
-        old_src = current_source_map[key]
-        new_src = cleaned_source_map[key]
-        diffs: dict[str, tuple[str | None, str | None]] = {}
-        for field in ("stat_rate",):
-            old_val = old_src.get(field)
-            new_val = new_src.get(field)
-            if old_val != new_val:
-                diffs[field] = (old_val, new_val)
-        if diffs:
-            updated_sources[key] = diffs
+    # Sources kept by apply_topology_prefs are the same objects in both lists,
+    # so key each distinct dict once.
+    keys_by_id = {id(s): _source_key(s) for s in current_sources}
+    current_source_map = {keys_by_id[id(s)]: s for s in current_sources}
+    cleaned_source_map = {
+        keys_by_id.get(id(s)) or _source_key(s): s for s in cleaned_sources
+    }
+    updated_sources = [
+        (_format_source_key(key), field, old_val, new_val)
+        for key, field, old_val, new_val in _diff_fields(
+            current_source_map, cleaned_source_map, ("stat_rate",),
+        )
+    ]
 
     if not added_consumption and not removed_consumption and not added_source_eids and not removed_source_eids and not updated_consumption and not updated_sources:
         print_ok("No changes needed — energy dashboard is up to date")
@@ -550,20 +580,14 @@ def _show_topology_diff(current: dict, cleaned: dict) -> None:
             console.print(f"  + {eid}")
 
     if updated_consumption:
-        print_info(f"Updating {len(updated_consumption)} device consumption entry/ies:")
-        for stat in sorted(updated_consumption):
-            for field, (old_val, new_val) in updated_consumption[stat].items():
-                old_disp = old_val or "(none)"
-                new_disp = new_val or "(none)"
-                console.print(f"  ~ {stat}: {field} {old_disp} → {new_disp}")
+        count = len({stat for stat, _, _, _ in updated_consumption})
+        print_info(f"Updating {count} device consumption entry/ies:")
+        _print_field_diffs(updated_consumption)
 
     if updated_sources:
-        print_info(f"Updating {len(updated_sources)} energy source(s):")
-        for key in sorted(updated_sources):
-            for field, (old_val, new_val) in updated_sources[key].items():
-                old_disp = old_val or "(none)"
-                new_disp = new_val or "(none)"
-                console.print(f"  ~ {key}: {field} {old_disp} → {new_disp}")
+        count = len({key for key, _, _, _ in updated_sources})
+        print_info(f"Updating {count} energy source(s):")
+        _print_field_diffs(updated_sources)
 
     if removed_source_eids:
         print_info("Removing energy source entity/ies:")
@@ -576,6 +600,32 @@ def _show_topology_diff(current: dict, cleaned: dict) -> None:
             console.print(f"  + {eid}")
 
 
+def _diff_fields(
+    old_map: dict[Any, dict],
+    new_map: dict[Any, dict],
+    fields: tuple[str, ...],
+) -> list[tuple[Any, str, Any, Any]]:
+    """List (key, field, old, new) for entries present in both maps whose fields differ.
+
+    Sorted by key; fields keep the order given.
+    """
+    diffs = [
+        (key, field, old_map[key].get(field), new_map[key].get(field))
+        for key in old_map.keys() & new_map.keys()
+        for field in fields
+        if old_map[key].get(field) != new_map[key].get(field)
+    ]
+    diffs.sort(key=lambda d: d[0])
+    return diffs
+
+
+def _print_field_diffs(diffs: list[tuple[Any, str, Any, Any]]) -> None:
+    for key, field, old_val, new_val in diffs:
+        old_disp = old_val or "(none)"
+        new_disp = new_val or "(none)"
+        console.print(f"  ~ {key}: {field} {old_disp} → {new_disp}")
+
+
 @click.command("energy-topology")
 @pass_ctx
 def energy_topology(ctx: Context) -> None:
@@ -586,8 +636,9 @@ def energy_topology(ctx: Context) -> None:
 async def _energy_topology_show(ctx: Context) -> None:
     """Display-only topology view."""
     async with ctx.client() as client:
-        devices, entities, areas = await fetch_registries(client)
-        states = await fetch_entity_states(client)
+        (devices, entities, areas), states = await asyncio.gather(
+            fetch_registries(client), fetch_entity_states(client),
+        )
 
     # Enrich entities with device_class/state_class from states
     enrich_entities_from_states(entities, states)
@@ -608,64 +659,69 @@ async def _energy_topology_show(ctx: Context) -> None:
 
 def extract_energy_entity_ids(prefs: dict[str, Any]) -> set[str]:
     """Extract all entity_ids referenced in energy dashboard config."""
-    ids: set[str] = set()
-    for source in prefs.get("energy_sources", []):
-        for flow in source.get("flow_from", []):
-            if stat := flow.get("stat_energy_from"):
-                ids.add(stat)
-        for flow in source.get("flow_to", []):
-            if stat := flow.get("stat_energy_to"):
-                ids.add(stat)
-        if stat := source.get("stat_energy_from"):
-            ids.add(stat)
-        if stat := source.get("stat_energy_to"):
-            ids.add(stat)
-    for device in prefs.get("device_consumption", []):
-        if stat := device.get("stat_consumption"):
-            ids.add(stat)
-    return ids
+    return set().union(
+        *map(_extract_source_entity_ids, prefs.get("energy_sources", [])),
+        (
+            stat
+            for device in prefs.get("device_consumption", [])
+            if (stat := device.get("stat_consumption"))
+        ),
+    )
 
 
-def find_stale_references(
+def iter_stale_references(
     prefs: dict[str, Any],
     all_entity_ids: set[str],
-) -> dict[str, list[str]]:
-    """Find energy dashboard references pointing to non-existent entities.
-
-    Returns a dict mapping section name to list of stale entity_ids.
-    """
-    stale: dict[str, list[str]] = {}
-
+) -> Iterator[tuple[str, str]]:
+    """Yield (section, entity_id) for energy dashboard references to missing entities."""
     for source in prefs.get("energy_sources", []):
         stype = source.get("type", "unknown")
         for flow in source.get("flow_from", []):
             if (stat := flow.get("stat_energy_from")) and stat not in all_entity_ids:
-                stale.setdefault(f"{stype} (grid import)", []).append(stat)
+                yield f"{stype} (grid import)", stat
         for flow in source.get("flow_to", []):
             if (stat := flow.get("stat_energy_to")) and stat not in all_entity_ids:
-                stale.setdefault(f"{stype} (grid export)", []).append(stat)
+                yield f"{stype} (grid export)", stat
         if (stat := source.get("stat_energy_from")) and stat not in all_entity_ids:
-            stale.setdefault(stype, []).append(stat)
+            yield stype, stat
         if (stat := source.get("stat_energy_to")) and stat not in all_entity_ids:
-            stale.setdefault(stype, []).append(stat)
+            yield stype, stat
 
     for device in prefs.get("device_consumption", []):
         if (stat := device.get("stat_consumption")) and stat not in all_entity_ids:
-            stale.setdefault("device_consumption", []).append(stat)
+            yield "device_consumption", stat
 
-    return stale
+
+def find_stale_references(
+    prefs: dict[str, Any],
+    all_entity_ids: set[str],
+) -> dict[str, list[str]]:
+    """Find energy dashboard references pointing to non-existent entities.
+
+    Returns a dict mapping section name to list of stale entity_ids.
+    """
+    stale: defaultdict[str, list[str]] = defaultdict(list)
+    for section, stat in iter_stale_references(prefs, all_entity_ids):
+        stale[section].append(stat)
+    return dict(stale)
 
 
 def remove_stale_references(
     prefs: dict[str, Any],
     stale_ids: set[str],
 ) -> dict[str, Any]:
-    """Return a copy of prefs with stale entity_id references removed."""
-    cleaned = copy.deepcopy(prefs)
+    """Return a copy of prefs with stale entity_id references removed.
 
+    Entries without stale references are shared with *prefs*; only sources
+    that change are copied, so *prefs* itself is never mutated.
+    """
     # Clean energy_sources
     clean_sources = []
-    for source in cleaned.get("energy_sources", []):
+    for source in prefs.get("energy_sources", []):
+        if _extract_source_entity_ids(source).isdisjoint(stale_ids):
+            clean_sources.append(source)
+            continue
+        source = dict(source)
         # Filter flow lists (only if originally present)
         if "flow_from" in source:
             source["flow_from"] = [
@@ -697,15 +753,14 @@ def remove_stale_references(
         )
         if has_refs:
             clean_sources.append(source)
-    cleaned["energy_sources"] = clean_sources
 
     # Clean device_consumption
-    cleaned["device_consumption"] = [
-        d for d in cleaned.get("device_consumption", [])
+    clean_consumption = [
+        d for d in prefs.get("device_consumption", [])
         if d.get("stat_consumption") not in stale_ids
     ]
 
-    return cleaned
+    return {**prefs, "energy_sources": clean_sources, "device_consumption": clean_consumption}
 
 
 @click.command("energy-audit")
@@ -717,40 +772,42 @@ def energy_audit(ctx: Context, prune: bool) -> None:
 
 
 async def _energy_audit(ctx: Context, prune: bool) -> None:
+    # One connection for the whole run, so pruning doesn't repeat the handshake.
     async with ctx.client() as client:
-        prefs = await fetch_energy_prefs(client)
-        raw_entities = await client.send_command("config/entity_registry/list")
+        prefs, raw_entities = await asyncio.gather(
+            fetch_energy_prefs(client),
+            client.send_command("config/entity_registry/list"),
+        )
         all_entity_ids = {e["entity_id"] for e in raw_entities}
 
-    ed_refs = extract_energy_entity_ids(prefs)
-    stale = find_stale_references(prefs, all_entity_ids)
+        ed_refs = extract_energy_entity_ids(prefs)
+        stale = find_stale_references(prefs, all_entity_ids)
 
-    print_info(f"Energy dashboard references {len(ed_refs)} entity ID(s)")
+        print_info(f"Energy dashboard references {len(ed_refs)} entity ID(s)")
 
-    if not stale:
-        print_ok("No stale references — all energy dashboard entities exist")
-        return
+        if not stale:
+            print_ok("No stale references — all energy dashboard entities exist")
+            return
 
-    total = sum(len(v) for v in stale.values())
-    print_warn(f"{total} stale reference(s) found:")
-    for section, ids in sorted(stale.items()):
-        console.print(f"\n  [bold]{section}[/bold]")
-        for entity_id in sorted(ids):
-            console.print(f"    - {entity_id}")
-    console.print()
+        total = sum(len(v) for v in stale.values())
+        print_warn(f"{total} stale reference(s) found:")
+        for section, ids in sorted(stale.items()):
+            console.print(f"\n  [bold]{section}[/bold]")
+            for entity_id in sorted(ids):
+                console.print(f"    - {entity_id}")
+        console.print()
 
-    if not prune:
-        print_info("Run with --prune to remove stale entries")
-        return
+        if not prune:
+            print_info("Run with --prune to remove stale entries")
+            return
 
-    if ctx.dry_run:
-        print_dry_run(f"Would remove {total} stale reference(s)")
-        return
+        if ctx.dry_run:
+            print_dry_run(f"Would remove {total} stale reference(s)")
+            return
 
-    stale_ids = {eid for ids in stale.values() for eid in ids}
-    cleaned = remove_stale_references(prefs, stale_ids)
+        stale_ids = set(chain.from_iterable(stale.values()))
+        cleaned = remove_stale_references(prefs, stale_ids)
 
-    async with ctx.client() as client:
         await client.send_command("energy/save_prefs", **cleaned)
 
     print_ok(f"Removed {total} stale reference(s) from energy dashboard")
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
+from collections.abc import Callable
 from types import TracebackType
 from typing import Any
 
@@ -11,6 +13,25 @@ import websockets
 from websockets import ClientConnection
 
 
+def _json_codec() -> tuple[Callable[[str | bytes], Any], Callable[[Any], str]]:
+    """Pick the JSON (loads, dumps) pair once; orjson is an optional speedup."""
+    try:
+        import orjson  # type: ignore[import-not-found]
+    except ImportError:
+        return json.loads, json.dumps
+    # HA only accepts text frames, so orjson's bytes are decoded back to str.
+    return orjson.loads, lambda obj: orjson.dumps(obj).decode()
+
+
+_loads, _dumps = _json_codec()
+
+
+@functools.cache
+def _frame_tail(msg_type: str) -> str:
+    """Serialized remainder of an argument-free command frame after its id."""
+    return f',"type":{_dumps(msg_type)}}}'
+
+
 class HAClientError(Exception):
     """Error from the HA WebSocket API."""
 
@@ -26,18 +47,19 @@ class HAClient:
 
     def __init__(self, url: str, token: str) -> None:
         self._url = url.rstrip("/")
-        self._token = token
+        base = self._url.replace("http://", "ws://").replace("https://", "wss://")
+        self._ws_url = f"{base}/api/websocket"
+        self._auth_frame = _dumps({"type": "auth", "access_token": token})
         self._ws: ClientConnection | None = None
         self._msg_id = 0
-
-    @property
-    def _ws_url(self) -> str:
-        base = self._url.replace("http://", "ws://").replace("https://", "wss://")
-        return f"{base}/api/websocket"
+        self._pending: dict[int, asyncio.Future[dict]] = {}
+        self._reader: asyncio.Task[None] | None = None
 
     async def __aenter__(self) -> HAClient:
         try:
             self._ws = await asyncio.wait_for(
+                # Registry and state dumps are large: allow big frames. They are
+                # also compressed, as websockets enables permessage-deflate by default.
                 websockets.connect(self._ws_url, max_size=16 * 1024 * 1024),
                 timeout=10.0,
             )
@@ -51,15 +73,15 @@ class HAClient:
         try:
             # HA sends auth_required on connect
             raw = await asyncio.wait_for(self._ws.recv(), timeout=10.0)
-            auth_required = json.loads(raw)
+            auth_required = _loads(raw)
             if auth_required.get("type") != "auth_required":
                 raise HAClientError(
                     f"Expected auth_required, got: {auth_required.get('type')}"
                 )
 
-            await self._ws.send(json.dumps({"type": "auth", "access_token": self._token}))
+            await self._ws.send(self._auth_frame)
             raw = await asyncio.wait_for(self._ws.recv(), timeout=10.0)
-            auth_result = json.loads(raw)
+            auth_result = _loads(raw)
             if auth_result.get("type") != "auth_ok":
                 msg = auth_result.get("message", "Unknown auth error")
                 raise HAClientError(f"Auth failed: {msg}")
@@ -69,6 +91,7 @@ class HAClient:
                 "Auth handshake timed out — Home Assistant may be overloaded"
             ) from None
 
+        self._reader = asyncio.create_task(self._read_loop(self._ws))
         return self
 
     async def __aexit__(
@@ -77,33 +100,59 @@ class HAClient:
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> None:
+        if self._reader:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
         if self._ws:
             await self._ws.close()
             self._ws = None
 
+    async def _read_loop(self, ws: ClientConnection) -> None:
+        """Route each incoming message to the command awaiting its id.
+
+        Responses can arrive in any order, which lets several commands be in
+        flight on the one connection.  If reading fails, every waiting command
+        gets the error and later commands fail fast.
+        """
+        try:
+            while True:
+                response = _loads(await ws.recv())
+                future = self._pending.get(response.get("id"))
+                if future and not future.done():
+                    future.set_result(response)
+        # Any failure ends the connection for every waiter, not just the
+        # ConnectionClosed case; anything uncaught would leave them hanging.
+        except Exception as exc:  # noqa: BLE001
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(exc)
+
     async def send_command(self, msg_type: str, **kwargs: Any) -> Any:
-        """Send a command and return the result payload."""
-        if not self._ws:
+        """Send a command and return the result payload.
+
+        Safe to call concurrently, e.g. via ``asyncio.gather``; each call
+        waits only for the response carrying its own id.
+        """
+        if not self._ws or not self._reader:
             raise HAClientError("Not connected")
+        if self._reader.done():
+            raise HAClientError(f"Connection lost before '{msg_type}'")
 
         self._msg_id += 1
-        msg = {"id": self._msg_id, "type": msg_type, **kwargs}
-        await self._ws.send(json.dumps(msg))
-
-        # Read responses until we get one matching our ID
+        msg_id = self._msg_id
+        future: asyncio.Future[dict] = asyncio.get_running_loop().create_future()
+        self._pending[msg_id] = future
         try:
-            while True:
-                raw = await asyncio.wait_for(self._ws.recv(), timeout=30.0)
-                response = json.loads(raw)
-                if response.get("id") == self._msg_id:
-                    if not response.get("success"):
-                        error = response.get("error", {})
-                        raise HAClientError(
-                            f"{msg_type} failed: {error.get('message', 'Unknown error')}"
-                        )
-                    return response.get("result")
-        except HAClientError:
-            raise
+            if kwargs:
+                frame = _dumps({"id": msg_id, "type": msg_type, **kwargs})
+            else:
+                frame = f'{{"id":{msg_id}{_frame_tail(msg_type)}'
+            await self._ws.send(frame)
+            response = await asyncio.wait_for(future, timeout=30.0)
         except TimeoutError:
             raise HAClientError(
                 f"Command '{msg_type}' timed out after 30s"
@@ -112,3 +161,12 @@ class HAClient:
             raise HAClientError(
                 f"Connection lost during '{msg_type}'"
             ) from None
+        finally:
+            del self._pending[msg_id]
+
+        if not response.get("success"):
+            error = response.get("error", {})
+            raise HAClientError(
+                f"{msg_type} failed: {error.get('message', 'Unknown error')}"
+            )
+        return response.get("result")
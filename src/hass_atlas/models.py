@@ -5,7 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class HAEntity:
     """A Home Assistant entity from the entity registry."""
 
@@ -23,7 +23,7 @@ class HAEntity:
     has_entity_name: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class HADevice:
     """A Home Assistant device from the device registry."""
 
@@ -31,7 +31,7 @@ class HADevice:
     name: str | None
     name_by_user: str | None = None
     model: str | None = None
-    identifiers: list[tuple[str, str]] = field(default_factory=list)
+    identifiers: tuple[tuple[str, str], ...] = ()
     via_device_id: str | None = None
     area_id: str | None = None
     entities: list[HAEntity] = field(default_factory=list)
@@ -42,7 +42,7 @@ class HADevice:
         return self.name_by_user or self.name or self.id
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class HAArea:
     """A Home Assistant area."""
 
@@ -50,7 +50,7 @@ class HAArea:
     name: str
 
 
-@dataclass
+@dataclass(slots=True)
 class SpanDeviceTree:
     """A SPAN panel and its child devices."""
 
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
+import sys
+from collections import defaultdict
 from typing import Any
 
 from hass_atlas.ha_client import HAClient
@@ -16,14 +19,22 @@ MODEL_SOLAR = "Solar PV"
 MODEL_EV_CHARGER = "EV Charger"
 MODEL_SITE_METERING = "Site Metering"
 
+# Child models that fill a single SpanDeviceTree slot; anything else is a circuit
+_SINGLE_CHILD_ATTRS = {
+    MODEL_BATTERY: "battery",
+    MODEL_SOLAR: "solar",
+    MODEL_EV_CHARGER: "ev_charger",
+    MODEL_SITE_METERING: "site_metering",
+}
+
 
 def _parse_device(raw: dict[str, Any]) -> HADevice:
     """Parse a raw device registry entry."""
-    identifiers = [
+    identifiers = tuple(
         (pair[0], pair[1])
         for pair in raw.get("identifiers", [])
         if isinstance(pair, (list, tuple)) and len(pair) == 2
-    ]
+    )
     return HADevice(
         id=raw["id"],
         name=raw.get("name"),
@@ -35,22 +46,27 @@ def _parse_device(raw: dict[str, Any]) -> HADevice:
     )
 
 
+def _intern[S: (str, None)](value: S) -> S:
+    """Intern a low-cardinality string so equal values share one object."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 def _parse_entity(raw: dict[str, Any]) -> HAEntity:
     """Parse a raw entity registry entry."""
     return HAEntity(
         entity_id=raw["entity_id"],
         unique_id=raw["unique_id"],
-        platform=raw.get("platform", ""),
+        platform=_intern(raw.get("platform", "")),
         device_id=raw.get("device_id"),
-        device_class=raw.get("device_class") or raw.get("original_device_class"),
-        state_class=raw.get("state_class") or raw.get("original_state_class"),
-        unit_of_measurement=(
+        device_class=_intern(raw.get("device_class") or raw.get("original_device_class")),
+        state_class=_intern(raw.get("state_class") or raw.get("original_state_class")),
+        unit_of_measurement=_intern(
             raw.get("unit_of_measurement") or raw.get("original_unit_of_measurement")
         ),
         name=raw.get("name"),
         original_name=raw.get("original_name"),
-        disabled_by=raw.get("disabled_by"),
-        entity_category=raw.get("entity_category"),
+        disabled_by=_intern(raw.get("disabled_by")),
+        entity_category=_intern(raw.get("entity_category")),
         has_entity_name=bool(raw.get("has_entity_name")),
     )
 
@@ -62,19 +78,33 @@ def _parse_area(raw: dict[str, Any]) -> HAArea:
 
 def _is_span_device(device: HADevice) -> bool:
     """Check if a device belongs to the span_ebus integration."""
-    return any(domain == DOMAIN for domain, _ in device.identifiers)
+    # Plain loop: identifiers usually has one pair, so a generator for any()
+    # would cost more than the comparison itself.
+    for domain, _ in device.identifiers:
+        if domain == DOMAIN:
+            return True
+    return False
+
+
+def _index_entities(entities: list[HAEntity]) -> dict[str, list[HAEntity]]:
+    """Group span_ebus entities by device_id in a single pass."""
+    entities_by_device: defaultdict[str, list[HAEntity]] = defaultdict(list)
+    for entity in entities:
+        if entity.platform == DOMAIN and entity.device_id:
+            entities_by_device[entity.device_id].append(entity)
+    return entities_by_device
 
 
 def _build_trees(
     devices: list[HADevice],
     entities: list[HAEntity],
 ) -> list[SpanDeviceTree]:
-    """Build SpanDeviceTree(s) from devices and entities."""
-    # Index entities by device_id
-    entities_by_device: dict[str, list[HAEntity]] = {}
-    for entity in entities:
-        if entity.device_id:
-            entities_by_device.setdefault(entity.device_id, []).append(entity)
+    """Build SpanDeviceTree(s) from devices and entities.
+
+    *entities* may be the full entity registry; only span_ebus entities
+    are attached to devices.
+    """
+    entities_by_device = _index_entities(entities)
 
     # Filter to span_ebus devices and attach entities
     span_devices: dict[str, HADevice] = {}
@@ -89,14 +119,14 @@ def _build_trees(
     # child devices are grouped under their parent panel.
     MODEL_PANEL = "SPAN Panel"
     panels: list[HADevice] = []
-    children_by_parent: dict[str, list[HADevice]] = {}
+    children_by_parent: defaultdict[str, list[HADevice]] = defaultdict(list)
     for device in span_devices.values():
         if device.model == MODEL_PANEL or not (
             device.via_device_id and device.via_device_id in span_devices
         ):
             panels.append(device)
         else:
-            children_by_parent.setdefault(device.via_device_id, []).append(device)
+            children_by_parent[device.via_device_id].append(device)
 
     # Build trees
     trees: list[SpanDeviceTree] = []
@@ -104,19 +134,10 @@ def _build_trees(
         tree = SpanDeviceTree(panel=panel)
         for child in children_by_parent.get(panel.id, []):
             panel.children.append(child)
-            model = child.model or ""
-            if model == MODEL_CIRCUIT:
-                tree.circuits.append(child)
-            elif model == MODEL_BATTERY:
-                tree.battery = child
-            elif model == MODEL_SOLAR:
-                tree.solar = child
-            elif model == MODEL_EV_CHARGER:
-                tree.ev_charger = child
-            elif model == MODEL_SITE_METERING:
-                tree.site_metering = child
+            if attr := _SINGLE_CHILD_ATTRS.get(child.model or ""):
+                setattr(tree, attr, child)
             else:
-                # Unknown child type — treat as circuit
+                # Circuits, and unknown child types treated as circuits
                 tree.circuits.append(child)
         trees.append(tree)
 
@@ -133,17 +154,17 @@ def enrich_entities_from_states(
     these are runtime properties only available in entity states.
     Call this after fetching both registries and states.
     """
+    states_get = states.get
     for entity in entities:
-        state_entry = states.get(entity.entity_id)
-        if not state_entry:
+        state_entry = states_get(entity.entity_id)
+        if not state_entry or not (attrs := state_entry.get("attributes")):
             continue
-        attrs = state_entry.get("attributes", {})
         if not entity.device_class and "device_class" in attrs:
-            entity.device_class = attrs["device_class"]
+            entity.device_class = _intern(attrs["device_class"])
         if not entity.state_class and "state_class" in attrs:
-            entity.state_class = attrs["state_class"]
+            entity.state_class = _intern(attrs["state_class"])
         if not entity.unit_of_measurement and "unit_of_measurement" in attrs:
-            entity.unit_of_measurement = attrs["unit_of_measurement"]
+            entity.unit_of_measurement = _intern(attrs["unit_of_measurement"])
 
 
 def build_span_trees(
@@ -151,15 +172,16 @@ def build_span_trees(
     entities: list[HAEntity],
 ) -> list[SpanDeviceTree]:
     """Build SPAN device trees from already-fetched registries."""
-    span_entities = [e for e in entities if e.platform == DOMAIN]
-    return _build_trees(devices, span_entities)
+    return _build_trees(devices, entities)
 
 
 async def fetch_registries(client: HAClient) -> tuple[list[HADevice], list[HAEntity], list[HAArea]]:
     """Fetch device, entity, and area registries from HA."""
-    raw_devices = await client.send_command("config/device_registry/list")
-    raw_entities = await client.send_command("config/entity_registry/list")
-    raw_areas = await client.send_command("config/area_registry/list")
+    raw_devices, raw_entities, raw_areas = await asyncio.gather(
+        client.send_command("config/device_registry/list"),
+        client.send_command("config/entity_registry/list"),
+        client.send_command("config/area_registry/list"),
+    )
 
     devices = [_parse_device(d) for d in raw_devices]
     entities = [_parse_entity(e) for e in raw_entities]
@@ -170,10 +192,18 @@ async def fetch_registries(client: HAClient) -> tuple[list[HADevice], list[HAEnt
 
 async def fetch_span_trees(client: HAClient) -> list[SpanDeviceTree]:
     """Fetch registries and build SPAN device trees."""
-    devices, entities, areas = await fetch_registries(client)
-    # Filter entities to span_ebus platform
-    span_entities = [e for e in entities if e.platform == DOMAIN]
-    return _build_trees(devices, span_entities)
+    raw_devices, raw_entities = await asyncio.gather(
+        client.send_command("config/device_registry/list"),
+        client.send_command("config/entity_registry/list"),
+    )
+    devices = [_parse_device(d) for d in raw_devices]
+    # Only span_ebus entities with a device can land in a tree; skip parsing the rest.
+    entities = [
+        _parse_entity(e)
+        for e in raw_entities
+        if e.get("platform") == DOMAIN and e.get("device_id")
+    ]
+    return _build_trees(devices, entities)
 
 
 async def fetch_areas(client: HAClient) -> list[HAArea]:
@@ -197,13 +227,14 @@ async def fetch_entity_states(
     If *entity_ids* is given, only those entities are included in the result.
     """
     raw_states: list[dict] = await client.send_command("get_states") or []
-    result: dict[str, dict] = {}
-    for entry in raw_states:
-        eid = entry.get("entity_id", "")
-        if entity_ids is not None and eid not in entity_ids:
-            continue
-        result[eid] = {
+    if entity_ids is not None:
+        # get_states has no server-side filter, so drop unwanted entries
+        # before building any result dicts for them.
+        raw_states = [e for e in raw_states if e.get("entity_id", "") in entity_ids]
+    return {
+        entry.get("entity_id", ""): {
             "state": entry.get("state"),
-            "attributes": entry.get("attributes", {}),
+            "attributes": entry.get("attributes") or {},
         }
-    return result
+        for entry in raw_states
+    }
@@ -506,6 +506,27 @@ def _find_circuit_by_node_id(
     return None
 
 
+def _circuit_consumption_role(
+    circuit: HADevice,
+    cr: CircuitRole | None,
+    parent_eid: str | None,
+) -> EnergyRole | None:
+    """Build the device_consumption role for a circuit, or None if it has none."""
+    consumption = _find_circuit_entity(circuit, "exported-energy")
+    if not consumption or (cr and cr.skip_consumption):
+        return None
+    power = _find_circuit_entity(circuit, "active-power")
+    return EnergyRole(
+        role="device_consumption",
+        entity_id=consumption.entity_id,
+        platform="span_ebus",
+        preferred=True,
+        reason=cr.reason if cr else "Circuit consumption",
+        parent_entity_id=parent_eid,
+        rate_entity_id=power.entity_id if power else None,
+    )
+
+
 def build_energy_topology(
     trees: list[SpanDeviceTree],
     topologies: list[SpanTopology],
@@ -809,23 +830,17 @@ def build_energy_topology(
     circuit_role_map: dict[str, CircuitRole] = {
         cr.circuit.id: cr for cr in circuit_roles
     }
-    for tree in trees:
-        serial = tree.serial
-        parent_eid = panel_parent_eids.get(serial) if serial else None
-        for circuit in tree.circuits:
-            cr = circuit_role_map.get(circuit.id)
-            consumption = _find_circuit_entity(circuit, "exported-energy")
-            if consumption and (not cr or not cr.skip_consumption):
-                power = _find_circuit_entity(circuit, "active-power")
-                assignments.append(EnergyRole(
-                    role="device_consumption",
-                    entity_id=consumption.entity_id,
-                    platform="span_ebus",
-                    preferred=True,
-                    reason=cr.reason if cr else "Circuit consumption",
-                    parent_entity_id=parent_eid,
-                    rate_entity_id=power.entity_id if power else None,
-                ))
+    trees_with_parents: list[tuple[SpanDeviceTree, str | None]] = [
+        (t, panel_parent_eids.get(t.serial) if t.serial else None) for t in trees
+    ]
+    for tree, parent_eid in trees_with_parents:
+        assignments.extend([
+            consumption_role
+            for circuit in tree.circuits
+            if (consumption_role := _circuit_consumption_role(
+                circuit, circuit_role_map.get(circuit.id), parent_eid
+            ))
+        ])
 
     return EnergyTopology(
         panels=topologies,
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-import copy
+import asyncio
 from typing import Any
 
 import click
@@ -25,101 +25,100 @@ def water(ctx: Context, entity_ids: tuple[str, ...]) -> None:
 
 
 async def _water(ctx: Context, explicit_ids: tuple[str, ...]) -> None:
+    # One connection for the whole run, so saving doesn't repeat the handshake.
     async with ctx.client() as client:
-        states = await fetch_entity_states(client)
-        current_prefs = await fetch_energy_prefs(client)
+        states, current_prefs = await asyncio.gather(
+            fetch_entity_states(client), fetch_energy_prefs(client),
+        )
 
-    if explicit_ids:
-        # Validate explicit IDs exist and are water sensors
-        water_ids = _validate_explicit(explicit_ids, states)
-    else:
-        water_ids = _discover_water_sensors(states)
+        if explicit_ids:
+            # Validate explicit IDs exist and are water sensors
+            sensors = _validate_explicit(explicit_ids, states)
+        else:
+            sensors = _discover_water_sensors(states)
 
-    if not water_ids:
-        print_warn("No water sensors found")
-        return
+        if not sensors:
+            print_warn("No water sensors found")
+            return
 
-    print_info(f"Found {len(water_ids)} water sensor(s):")
-    for eid in sorted(water_ids):
-        attrs = states.get(eid, {}).get("attributes", {})
-        unit = attrs.get("unit_of_measurement", "?")
-        friendly = attrs.get("friendly_name", eid)
-        console.print(f"  - {eid} ({friendly}, {unit})")
+        print_info(f"Found {len(sensors)} water sensor(s):")
+        for eid, attrs in sorted(sensors, key=lambda sensor: sensor[0]):
+            unit = attrs.get("unit_of_measurement", "?")
+            friendly = attrs.get("friendly_name", eid)
+            console.print(f"  - {eid} ({friendly}, {unit})")
 
-    merged = merge_water_prefs(current_prefs, water_ids)
-    _show_diff(current_prefs, merged)
+        merged, added_ids = _merge_water_additions(current_prefs, [eid for eid, _ in sensors])
+        _show_diff(added_ids)
 
-    if ctx.dry_run:
-        print_dry_run("Would save energy dashboard config (use without --dry-run to apply)")
-        return
+        if ctx.dry_run:
+            print_dry_run("Would save energy dashboard config (use without --dry-run to apply)")
+            return
 
-    async with ctx.client() as client:
         await client.send_command("energy/save_prefs", **merged)
 
     print_ok("Energy dashboard water config saved")
 
 
-def _discover_water_sensors(states: dict[str, dict]) -> list[str]:
-    """Find sensors with device_class=water and state_class=total_increasing."""
-    water_ids = []
-    for eid, state in states.items():
-        if not eid.startswith("sensor."):
-            continue
-        attrs = state.get("attributes", {})
-        if (
-            attrs.get("device_class") == "water"
-            and attrs.get("state_class") == "total_increasing"
-        ):
-            water_ids.append(eid)
-    return sorted(water_ids)
+def _discover_water_sensors(states: dict[str, dict]) -> list[tuple[str, dict]]:
+    """Find sensors with device_class=water and state_class=total_increasing.
+
+    Returns ``(entity_id, attributes)`` pairs sorted by entity_id.
+    """
+    # Test the rare device_class first so most states are rejected after one lookup.
+    return sorted(
+        (eid, attrs)
+        for eid, state in states.items()
+        if (attrs := state.get("attributes"))
+        and attrs.get("device_class") == "water"
+        and attrs.get("state_class") == "total_increasing"
+        and eid.startswith("sensor.")
+    )
 
 
 def _validate_explicit(
     entity_ids: tuple[str, ...], states: dict[str, dict]
-) -> list[str]:
-    """Validate explicit entity IDs exist in HA."""
-    valid = []
-    for eid in entity_ids:
+) -> list[tuple[str, dict]]:
+    """Validate explicit entity IDs exist in HA, dropping repeats.
+
+    Returns ``(entity_id, attributes)`` pairs in the order given.
+    """
+    unique_ids = dict.fromkeys(entity_ids)
+    for eid in unique_ids:
         if eid not in states:
             print_warn(f"Entity not found: {eid}")
-        else:
-            valid.append(eid)
-    return valid
+    return [
+        (eid, states[eid].get("attributes") or {}) for eid in unique_ids if eid in states
+    ]
 
 
 def merge_water_prefs(current: dict, water_ids: list[str]) -> dict:
-    """Merge water sensors into current energy prefs, only adding missing entries."""
-    merged = copy.deepcopy(current)
-
-    existing_water = merged.get("device_consumption_water", [])
-    existing_stats = {w.get("stat_consumption") for w in existing_water}
+    """Merge water sensors into current energy prefs, only adding missing entries.
 
-    for eid in water_ids:
-        if eid not in existing_stats:
-            existing_water.append({
-                "stat_consumption": eid,
-            })
-            existing_stats.add(eid)
-
-    merged["device_consumption_water"] = existing_water
-    return merged
+    Returns *current* itself when every sensor is already present.
+    """
+    return _merge_water_additions(current, water_ids)[0]
 
 
-def _show_diff(current: dict, merged: dict) -> None:
-    """Show what would change."""
-    current_water = current.get("device_consumption_water", [])
-    merged_water = merged.get("device_consumption_water", [])
+def _merge_water_additions(current: dict, water_ids: list[str]) -> tuple[dict, list[str]]:
+    """Like ``merge_water_prefs``, but also return the entity_ids that were added."""
+    existing_water = current.get("device_consumption_water", [])
+    existing_stats = {w.get("stat_consumption") for w in existing_water}
+    added_ids = [eid for eid in dict.fromkeys(water_ids) if eid not in existing_stats]
+    if not added_ids:
+        return current, added_ids
+    # Existing entries are shared, not mutated.
+    new_entries = [{"stat_consumption": eid} for eid in added_ids]
+    return {**current, "device_consumption_water": existing_water + new_entries}, added_ids
 
-    current_ids = {w.get("stat_consumption") for w in current_water}
-    merged_ids = {w.get("stat_consumption") for w in merged_water}
-    new_ids = merged_ids - current_ids
 
+def _show_diff(added_ids: list[str]) -> None:
+    """Show what would change, given the entity_ids ``_merge_water_additions`` added."""
     console.rule("[bold]Energy Dashboard Water Changes[/bold]")
 
-    if not new_ids:
+    if not added_ids:
         print_ok("No changes needed — water tab is up to date")
         return
 
-    print_info(f"Adding {len(new_ids)} water source(s):")
-    for eid in sorted(new_ids):
+    print_info(f"Adding {len(added_ids)} water source(s):")
+    for eid in sorted(added_ids):
         console.print(f"  + {eid}")
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any
 
 import pytest
@@ -19,6 +21,8 @@ CIRCUIT_2_DEVICE_ID = "dev-circuit-002"
 CIRCUIT_1_NODE_ID = "c1-node"
 CIRCUIT_2_NODE_ID = "c2-node"
 
+_UNIT_BY_DEVICE_CLASS = {"energy": "kWh", "power": "W"}
+
 
 def make_entity(
     entity_id: str,
@@ -36,20 +40,54 @@ def make_entity(
         device_id=device_id,
         device_class=device_class,
         state_class=state_class,
-        unit_of_measurement="kWh" if device_class == "energy" else None,
-        original_name=entity_id.split(".")[-1],
+        unit_of_measurement=_UNIT_BY_DEVICE_CLASS.get(device_class),
+        original_name=entity_id.rpartition(".")[2],
         disabled_by=disabled_by,
         entity_category=entity_category,
     )
 
 
+_SOLAR_PROPERTIES = ("relative-position", "vendor-name", "product-name", "feed")
+_BESS_PROPERTIES = ("relative-position", "vendor-name", "model", "serial-number", "feed")
+
+
+def _property_entities(prefix: str, device_id: str, properties: tuple[str, ...]) -> list[HAEntity]:
+    """Diagnostic topology property entities, e.g. ``sensor.span_pv_vendor_name``."""
+    return [
+        make_entity(
+            f"sensor.span_{prefix}_{prop.replace('-', '_')}",
+            f"{SERIAL}_{prefix}_{prop}",
+            device_id,
+            entity_category="diagnostic",
+        )
+        for prop in properties
+    ]
+
+
+def _circuit_energy_entities(name: str, node_id: str, device_id: str) -> list[HAEntity]:
+    """Consumed/returned energy pair for a circuit, as the integration names them."""
+    return [
+        make_entity(
+            f"sensor.span_{name}_energy{suffix}",
+            f"{SERIAL}_{node_id}_{direction}-energy",
+            device_id,
+            device_class="energy",
+            state_class="total_increasing",
+        )
+        for direction, suffix in (("exported", ""), ("imported", "_returned"))
+    ]
+
+
+# SPAN device fixtures stay function-scoped: tests reassign area_id/entities
+# and append to circuit lists. Read-only data below is session-scoped.
+
 @pytest.fixture
 def panel_device() -> HADevice:
     return HADevice(
         id=PANEL_DEVICE_ID,
         name="SPAN Panel",
         model="SPAN Panel",
-        identifiers=[("span_ebus", SERIAL)],
+        identifiers=(("span_ebus", SERIAL),),
     )
 
 
@@ -59,7 +97,7 @@ def site_meter_device() -> HADevice:
         id=SITE_METER_DEVICE_ID,
         name="Site Metering",
         model="Site Metering",
-        identifiers=[("span_ebus", f"{SERIAL}_site-meter")],
+        identifiers=(("span_ebus", f"{SERIAL}_site-meter"),),
         via_device_id=PANEL_DEVICE_ID,
         entities=[
             make_entity(
@@ -86,7 +124,7 @@ def solar_device() -> HADevice:
         id=SOLAR_DEVICE_ID,
         name="Solar PV",
         model="Solar PV",
-        identifiers=[("span_ebus", f"{SERIAL}_solar")],
+        identifiers=(("span_ebus", f"{SERIAL}_solar"),),
         via_device_id=PANEL_DEVICE_ID,
         entities=[
             make_entity(
@@ -97,30 +135,7 @@ def solar_device() -> HADevice:
                 state_class="total_increasing",
             ),
             # Topology property entities
-            make_entity(
-                "sensor.span_pv_relative_position",
-                f"{SERIAL}_pv_relative-position",
-                SOLAR_DEVICE_ID,
-                entity_category="diagnostic",
-            ),
-            make_entity(
-                "sensor.span_pv_vendor_name",
-                f"{SERIAL}_pv_vendor-name",
-                SOLAR_DEVICE_ID,
-                entity_category="diagnostic",
-            ),
-            make_entity(
-                "sensor.span_pv_product_name",
-                f"{SERIAL}_pv_product-name",
-                SOLAR_DEVICE_ID,
-                entity_category="diagnostic",
-            ),
-            make_entity(
-                "sensor.span_pv_feed",
-                f"{SERIAL}_pv_feed",
-                SOLAR_DEVICE_ID,
-                entity_category="diagnostic",
-            ),
+            *_property_entities("pv", SOLAR_DEVICE_ID, _SOLAR_PROPERTIES),
         ],
     )
 
@@ -131,7 +146,7 @@ def battery_device() -> HADevice:
         id=BATTERY_DEVICE_ID,
         name="Battery Storage",
         model="Battery Storage",
-        identifiers=[("span_ebus", f"{SERIAL}_battery")],
+        identifiers=(("span_ebus", f"{SERIAL}_battery"),),
         via_device_id=PANEL_DEVICE_ID,
         entities=[
             make_entity(
@@ -149,36 +164,7 @@ def battery_device() -> HADevice:
                 state_class="total_increasing",
             ),
             # Topology property entities
-            make_entity(
-                "sensor.span_bess_relative_position",
-                f"{SERIAL}_bess_relative-position",
-                BATTERY_DEVICE_ID,
-                entity_category="diagnostic",
-            ),
-            make_entity(
-                "sensor.span_bess_vendor_name",
-                f"{SERIAL}_bess_vendor-name",
-                BATTERY_DEVICE_ID,
-                entity_category="diagnostic",
-            ),
-            make_entity(
-                "sensor.span_bess_model",
-                f"{SERIAL}_bess_model",
-                BATTERY_DEVICE_ID,
-                entity_category="diagnostic",
-            ),
-            make_entity(
-                "sensor.span_bess_serial_number",
-                f"{SERIAL}_bess_serial-number",
-                BATTERY_DEVICE_ID,
-                entity_category="diagnostic",
-            ),
-            make_entity(
-                "sensor.span_bess_feed",
-                f"{SERIAL}_bess_feed",
-                BATTERY_DEVICE_ID,
-                entity_category="diagnostic",
-            ),
+            *_property_entities("bess", BATTERY_DEVICE_ID, _BESS_PROPERTIES),
         ],
     )
 
@@ -190,24 +176,11 @@ def circuit_devices() -> list[HADevice]:
             id=CIRCUIT_1_DEVICE_ID,
             name="Kitchen",
             model="Circuit",
-            identifiers=[("span_ebus", f"{SERIAL}_{CIRCUIT_1_NODE_ID}")],
+            identifiers=(("span_ebus", f"{SERIAL}_{CIRCUIT_1_NODE_ID}"),),
             via_device_id=PANEL_DEVICE_ID,
             area_id="area-kitchen",
             entities=[
-                make_entity(
-                    "sensor.span_kitchen_energy",
-                    f"{SERIAL}_{CIRCUIT_1_NODE_ID}_exported-energy",
-                    CIRCUIT_1_DEVICE_ID,
-                    device_class="energy",
-                    state_class="total_increasing",
-                ),
-                make_entity(
-                    "sensor.span_kitchen_energy_returned",
-                    f"{SERIAL}_{CIRCUIT_1_NODE_ID}_imported-energy",
-                    CIRCUIT_1_DEVICE_ID,
-                    device_class="energy",
-                    state_class="total_increasing",
-                ),
+                *_circuit_energy_entities("kitchen", CIRCUIT_1_NODE_ID, CIRCUIT_1_DEVICE_ID),
                 make_entity(
                     "sensor.span_kitchen_active_power",
                     f"{SERIAL}_{CIRCUIT_1_NODE_ID}_active-power",
@@ -220,24 +193,9 @@ def circuit_devices() -> list[HADevice]:
             id=CIRCUIT_2_DEVICE_ID,
             name="Garage",
             model="Circuit",
-            identifiers=[("span_ebus", f"{SERIAL}_{CIRCUIT_2_NODE_ID}")],
+            identifiers=(("span_ebus", f"{SERIAL}_{CIRCUIT_2_NODE_ID}"),),
             via_device_id=PANEL_DEVICE_ID,
-            entities=[
-                make_entity(
-                    "sensor.span_garage_energy",
-                    f"{SERIAL}_{CIRCUIT_2_NODE_ID}_exported-energy",
-                    CIRCUIT_2_DEVICE_ID,
-                    device_class="energy",
-                    state_class="total_increasing",
-                ),
-                make_entity(
-                    "sensor.span_garage_energy_returned",
-                    f"{SERIAL}_{CIRCUIT_2_NODE_ID}_imported-energy",
-                    CIRCUIT_2_DEVICE_ID,
-                    device_class="energy",
-                    state_class="total_increasing",
-                ),
-            ],
+            entities=_circuit_energy_entities("garage", CIRCUIT_2_NODE_ID, CIRCUIT_2_DEVICE_ID),
         ),
     ]
 
@@ -250,7 +208,7 @@ def span_tree(
     battery_device: HADevice,
     circuit_devices: list[HADevice],
 ) -> SpanDeviceTree:
-    panel_device.children = [site_meter_device, solar_device, battery_device] + circuit_devices
+    panel_device.children = [site_meter_device, solar_device, battery_device, *circuit_devices]
     return SpanDeviceTree(
         panel=panel_device,
         circuits=circuit_devices,
@@ -260,7 +218,7 @@ def span_tree(
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_areas() -> list[HAArea]:
     return [
         HAArea(area_id="area-kitchen", name="Kitchen"),
@@ -268,12 +226,25 @@ def sample_areas() -> list[HAArea]:
     ]
 
 
+@pytest.fixture(scope="session")
+def area_by_name(sample_areas: list[HAArea]) -> Mapping[str, HAArea]:
+    return MappingProxyType({a.name: a for a in sample_areas})
+
+
 # --- Raw WS response fixtures for registry parsing ---
 
-@pytest.fixture
-def raw_devices() -> list[dict]:
+RawRows = tuple[Mapping[str, Any], ...]
+
+
+def _freeze(rows: list[dict[str, Any]]) -> RawRows:
+    """Wrap session-scoped payloads read-only so a mutating test fails loudly."""
+    return tuple(MappingProxyType(row) for row in rows)
+
+
+@pytest.fixture(scope="session")
+def raw_devices() -> RawRows:
     """Raw device registry responses as HA returns them."""
-    return [
+    return _freeze([
         {
             "id": PANEL_DEVICE_ID,
             "name": "SPAN Panel",
@@ -320,13 +291,13 @@ def raw_devices() -> list[dict]:
             "via_device_id": None,
             "area_id": None,
         },
-    ]
+    ])
 
 
-@pytest.fixture
-def raw_entities() -> list[dict]:
+@pytest.fixture(scope="session")
+def raw_entities() -> RawRows:
     """Raw entity registry responses."""
-    return [
+    return _freeze([
         {
             "entity_id": "sensor.span_site_imported_energy",
             "unique_id": f"{SERIAL}_site-meter_imported-energy",
@@ -424,15 +395,15 @@ def raw_entities() -> list[dict]:
             "disabled_by": None,
             "entity_category": None,
         },
-    ]
+    ])
 
 
-@pytest.fixture
-def raw_areas() -> list[dict]:
-    return [
+@pytest.fixture(scope="session")
+def raw_areas() -> RawRows:
+    return _freeze([
         {"area_id": "area-kitchen", "name": "Kitchen"},
         {"area_id": "area-living", "name": "Living Room"},
-    ]
+    ])
 
 
 # ---------------------------------------------------------------------------
@@ -463,22 +434,22 @@ def make_platform_entity(
         device_id=device_id,
         device_class=device_class,
         state_class=state_class,
-        unit_of_measurement="kWh" if device_class == "energy" else None,
-        original_name=entity_id.split(".")[-1],
+        unit_of_measurement=_UNIT_BY_DEVICE_CLASS.get(device_class),
+        original_name=entity_id.rpartition(".")[2],
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def powerwall_device() -> HADevice:
     return HADevice(
         id=PW_DEVICE_ID,
         name="Powerwall",
         model="Gateway",
-        identifiers=[("powerwall", "pw-gateway-001")],
+        identifiers=(("powerwall", "pw-gateway-001"),),
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def powerwall_entities() -> list[HAEntity]:
     return [
         make_platform_entity(
@@ -516,17 +487,17 @@ def powerwall_entities() -> list[HAEntity]:
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def enphase_device() -> HADevice:
     return HADevice(
         id=ENPHASE_DEVICE_ID,
         name="Enphase Envoy",
         model="Envoy-S",
-        identifiers=[("enphase_envoy", "envoy-001")],
+        identifiers=(("enphase_envoy", "envoy-001"),),
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def enphase_entities() -> list[HAEntity]:
     return [
         make_platform_entity(
@@ -547,24 +518,13 @@ def pv_feed_circuit() -> HADevice:
         id=PV_FEED_CIRCUIT_DEVICE_ID,
         name="Commissioned PV System",
         model="Circuit",
-        identifiers=[("span_ebus", f"{SERIAL}_{PV_FEED_CIRCUIT_NODE_ID}")],
+        identifiers=(("span_ebus", f"{SERIAL}_{PV_FEED_CIRCUIT_NODE_ID}"),),
         via_device_id=PANEL_DEVICE_ID,
-        entities=[
-            make_entity(
-                "sensor.span_pv_system_energy",
-                f"{SERIAL}_{PV_FEED_CIRCUIT_NODE_ID}_exported-energy",
-                PV_FEED_CIRCUIT_DEVICE_ID,
-                device_class="energy",
-                state_class="total_increasing",
-            ),
-            make_entity(
-                "sensor.span_pv_system_energy_returned",
-                f"{SERIAL}_{PV_FEED_CIRCUIT_NODE_ID}_imported-energy",
-                PV_FEED_CIRCUIT_DEVICE_ID,
-                device_class="energy",
-                state_class="total_increasing",
-            ),
-        ],
+        entities=_circuit_energy_entities(
+            "pv_system",
+            PV_FEED_CIRCUIT_NODE_ID,
+            PV_FEED_CIRCUIT_DEVICE_ID,
+        ),
     )
 
 
@@ -575,27 +535,26 @@ def bess_feed_circuit() -> HADevice:
         id=BESS_FEED_CIRCUIT_DEVICE_ID,
         name="Battery Circuit",
         model="Circuit",
-        identifiers=[("span_ebus", f"{SERIAL}_{BESS_FEED_CIRCUIT_NODE_ID}")],
+        identifiers=(("span_ebus", f"{SERIAL}_{BESS_FEED_CIRCUIT_NODE_ID}"),),
         via_device_id=PANEL_DEVICE_ID,
-        entities=[
-            make_entity(
-                "sensor.span_battery_circuit_energy",
-                f"{SERIAL}_{BESS_FEED_CIRCUIT_NODE_ID}_exported-energy",
-                BESS_FEED_CIRCUIT_DEVICE_ID,
-                device_class="energy",
-                state_class="total_increasing",
-            ),
-            make_entity(
-                "sensor.span_battery_circuit_energy_returned",
-                f"{SERIAL}_{BESS_FEED_CIRCUIT_NODE_ID}_imported-energy",
-                BESS_FEED_CIRCUIT_DEVICE_ID,
-                device_class="energy",
-                state_class="total_increasing",
-            ),
-        ],
+        entities=_circuit_energy_entities(
+            "battery_circuit",
+            BESS_FEED_CIRCUIT_NODE_ID,
+            BESS_FEED_CIRCUIT_DEVICE_ID,
+        ),
     )
 
 
+def _entity_ids_by_suffix(device: HADevice | None) -> dict[str, str]:
+    """Map each entity's unique_id suffix (after the last ``_``) to its entity_id."""
+    if device is None:
+        return {}
+    index: dict[str, str] = {}
+    for entity in device.entities:
+        index.setdefault(entity.unique_id.rpartition("_")[2], entity.entity_id)
+    return index
+
+
 def make_topology_states(
     *,
     battery: HADevice | None = None,
@@ -618,36 +577,23 @@ def make_topology_states(
     code looks up states (by entity_id found on the sub-device, not constructed
     from the serial).
     """
-    states: dict[str, dict[str, Any]] = {}
-
-    def _find_eid(device: HADevice | None, suffix: str) -> str | None:
-        if device is None:
-            return None
-        for entity in device.entities:
-            if entity.unique_id.endswith(suffix):
-                return entity.entity_id
-        return None
-
-    def _add(device: HADevice | None, suffix: str, value: str | None, attrs: dict | None = None) -> None:
-        eid = _find_eid(device, suffix)
-        if eid is None:
-            return
-        states[eid] = {
-            "state": value if value else "unknown",
-            "attributes": attrs or {},
-        }
-
-    _add(battery, "_relative-position", bess_position)
-    _add(battery, "_vendor-name", bess_vendor)
-    _add(battery, "_model", bess_model)
-    _add(battery, "_serial-number", bess_serial)
-    _add(battery, "_feed", bess_feed_name,
-         {"circuit_id": bess_feed_circuit_id} if bess_feed_circuit_id else {})
-
-    _add(solar, "_relative-position", pv_position)
-    _add(solar, "_vendor-name", pv_vendor)
-    _add(solar, "_product-name", pv_product)
-    _add(solar, "_feed", pv_feed_name,
-         {"circuit_id": pv_feed_circuit_id} if pv_feed_circuit_id else {})
-
-    return states
+    battery_eids = _entity_ids_by_suffix(battery)
+    solar_eids = _entity_ids_by_suffix(solar)
+    rows = (
+        (battery_eids, "relative-position", bess_position, {}),
+        (battery_eids, "vendor-name", bess_vendor, {}),
+        (battery_eids, "model", bess_model, {}),
+        (battery_eids, "serial-number", bess_serial, {}),
+        (battery_eids, "feed", bess_feed_name,
+         {"circuit_id": bess_feed_circuit_id} if bess_feed_circuit_id else {}),
+        (solar_eids, "relative-position", pv_position, {}),
+        (solar_eids, "vendor-name", pv_vendor, {}),
+        (solar_eids, "product-name", pv_product, {}),
+        (solar_eids, "feed", pv_feed_name,
+         {"circuit_id": pv_feed_circuit_id} if pv_feed_circuit_id else {}),
+    )
+    return {
+        eid: {"state": value or "unknown", "attributes": attrs}
+        for eids, suffix, value, attrs in rows
+        if (eid := eids.get(suffix)) is not None
+    }
@@ -2,50 +2,38 @@
 
 from __future__ import annotations
 
-from hass_atlas.areas import _plan_assignments
-from hass_atlas.models import HAArea, SpanDeviceTree
+from collections.abc import Mapping
 
+import pytest
 
-def test_plan_assignments_default_mapping(
-    span_tree: SpanDeviceTree, sample_areas: list[HAArea]
-) -> None:
-    """With no mapping file, device name → area name."""
-    area_by_name = {a.name: a for a in sample_areas}
-    actions = _plan_assignments([span_tree], {}, area_by_name)
-
-    # Kitchen already has area-kitchen, should be skipped
-    # Garage has no area, should be planned
-    assert len(actions) == 1
-    assert actions[0].device_name == "Garage"
-    assert actions[0].area_name == "Garage"
-    assert actions[0].needs_create is True  # "Garage" area doesn't exist
-
-
-def test_plan_assignments_with_mapping(
-    span_tree: SpanDeviceTree, sample_areas: list[HAArea]
-) -> None:
-    """Custom mapping overrides default."""
-    area_by_name = {a.name: a for a in sample_areas}
-    mapping = {"Kitchen": "Kitchen", "Garage": "Living Room"}
-    actions = _plan_assignments([span_tree], mapping, area_by_name)
-
-    # Kitchen already correct → skipped
-    # Garage → Living Room (exists) → planned
-    assert len(actions) == 1
-    assert actions[0].device_name == "Garage"
-    assert actions[0].area_name == "Living Room"
-    assert actions[0].needs_create is False
+from hass_atlas.areas import _plan_assignments
+from hass_atlas.models import HAArea, SpanDeviceTree
 
 
-def test_plan_assignments_skip_null(
-    span_tree: SpanDeviceTree, sample_areas: list[HAArea]
+@pytest.mark.parametrize(
+    "mapping, expected",
+    [
+        # No mapping file: device name → area name. Kitchen already has
+        # area-kitchen; Garage has no area and "Garage" doesn't exist yet.
+        pytest.param({}, [("Garage", "Garage", True)], id="default_mapping"),
+        # Custom mapping overrides default; Living Room exists.
+        pytest.param(
+            {"Kitchen": "Kitchen", "Garage": "Living Room"},
+            [("Garage", "Living Room", False)],
+            id="with_mapping",
+        ),
+        # null in mapping means skip.
+        pytest.param({"Kitchen": "Kitchen", "Garage": None}, [], id="skip_null"),
+    ],
+)
+def test_plan_assignments(
+    span_tree: SpanDeviceTree,
+    area_by_name: Mapping[str, HAArea],
+    mapping: dict[str, str | None],
+    expected: list[tuple[str, str, bool]],
 ) -> None:
-    """null in mapping means skip."""
-    area_by_name = {a.name: a for a in sample_areas}
-    mapping = {"Kitchen": "Kitchen", "Garage": None}
     actions = _plan_assignments([span_tree], mapping, area_by_name)
-    # Both skipped (Kitchen correct, Garage null)
-    assert len(actions) == 0
+    assert [(a.device_name, a.area_name, a.needs_create) for a in actions] == expected
 
 
 def test_plan_assignments_all_correct(
@@ -64,12 +52,11 @@ def test_plan_assignments_all_correct(
 
 
 def test_plan_assignments_reassign(
-    span_tree: SpanDeviceTree, sample_areas: list[HAArea]
+    span_tree: SpanDeviceTree, area_by_name: Mapping[str, HAArea]
 ) -> None:
     """Device assigned to wrong area should be reassigned."""
     # Kitchen assigned to Living Room instead of Kitchen
     span_tree.circuits[0].area_id = "area-living"
-    area_by_name = {a.name: a for a in sample_areas}
     actions = _plan_assignments([span_tree], {}, area_by_name)
 
     kitchen_action = next(a for a in actions if a.device_name == "Kitchen")
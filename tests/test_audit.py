@@ -2,45 +2,51 @@
 
 from __future__ import annotations
 
+import pytest
+
 from hass_atlas.audit import _report_energy_gaps, _report_no_area
 from hass_atlas.energy import extract_energy_entity_ids as _extract_energy_entity_ids
 from hass_atlas.models import SpanDeviceTree
 
 
-def test_extract_energy_entity_ids_grid() -> None:
-    prefs = {
-        "energy_sources": [
+@pytest.mark.parametrize(
+    "prefs, expected",
+    [
+        pytest.param(
             {
-                "type": "grid",
-                "flow_from": [{"stat_energy_from": "sensor.grid_import"}],
-                "flow_to": [{"stat_energy_to": "sensor.grid_export"}],
-            }
-        ],
-        "device_consumption": [
-            {"stat_consumption": "sensor.kitchen_energy"},
-        ],
-    }
-    ids = _extract_energy_entity_ids(prefs)
-    assert ids == {"sensor.grid_import", "sensor.grid_export", "sensor.kitchen_energy"}
-
-
-def test_extract_energy_entity_ids_solar_battery() -> None:
-    prefs = {
-        "energy_sources": [
-            {"type": "solar", "stat_energy_from": "sensor.solar_energy"},
+                "energy_sources": [
+                    {
+                        "type": "grid",
+                        "flow_from": [{"stat_energy_from": "sensor.grid_import"}],
+                        "flow_to": [{"stat_energy_to": "sensor.grid_export"}],
+                    }
+                ],
+                "device_consumption": [
+                    {"stat_consumption": "sensor.kitchen_energy"},
+                ],
+            },
+            {"sensor.grid_import", "sensor.grid_export", "sensor.kitchen_energy"},
+            id="grid",
+        ),
+        pytest.param(
             {
-                "type": "battery",
-                "stat_energy_from": "sensor.batt_discharge",
-                "stat_energy_to": "sensor.batt_charge",
+                "energy_sources": [
+                    {"type": "solar", "stat_energy_from": "sensor.solar_energy"},
+                    {
+                        "type": "battery",
+                        "stat_energy_from": "sensor.batt_discharge",
+                        "stat_energy_to": "sensor.batt_charge",
+                    },
+                ],
             },
-        ],
-    }
-    ids = _extract_energy_entity_ids(prefs)
-    assert ids == {"sensor.solar_energy", "sensor.batt_discharge", "sensor.batt_charge"}
-
-
-def test_extract_energy_entity_ids_empty() -> None:
-    assert _extract_energy_entity_ids({}) == set()
+            {"sensor.solar_energy", "sensor.batt_discharge", "sensor.batt_charge"},
+            id="solar_battery",
+        ),
+        pytest.param({}, set(), id="empty"),
+    ],
+)
+def test_extract_energy_entity_ids(prefs: dict, expected: set[str]) -> None:
+    assert _extract_energy_entity_ids(prefs) == expected
 
 
 def test_report_no_area_all_assigned(span_tree: SpanDeviceTree) -> None:
@@ -60,12 +66,13 @@ def test_report_no_area_missing(span_tree: SpanDeviceTree) -> None:
 
 def test_report_energy_gaps_none_missing(span_tree: SpanDeviceTree) -> None:
     # All energy entities are "in" the dashboard
-    energy_ids = set()
-    for device in [span_tree.panel, span_tree.site_metering] + span_tree.circuits:
-        if device:
-            for e in device.entities:
-                if e.device_class == "energy":
-                    energy_ids.add(e.entity_id)
+    energy_ids = {
+        e.entity_id
+        for device in (span_tree.panel, span_tree.site_metering, *span_tree.circuits)
+        if device
+        for e in device.entities
+        if e.device_class == "energy"
+    }
     _report_energy_gaps([span_tree], energy_ids)
 
 
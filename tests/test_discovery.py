@@ -0,0 +1,89 @@
+"""Tests for mDNS discovery of Home Assistant instances."""
+
+from __future__ import annotations
+
+import socket
+
+from zeroconf import ServiceInfo
+
+from hass_atlas.discovery import HA_SERVICE_TYPE, HAInstance, _HAListener
+
+
+class FakeZeroconf:
+    """Stands in for Zeroconf, answering get_service_info from a fixed table."""
+
+    def __init__(self, infos: list[ServiceInfo]) -> None:
+        self._infos = {info.name: info for info in infos}
+
+    def get_service_info(self, type_: str, name: str) -> ServiceInfo | None:
+        return self._infos.get(name)
+
+
+def _service_info(
+    instance: str,
+    ip: str,
+    server: str = "homeassistant.local.",
+    port: int = 8123,
+    properties: dict[bytes, bytes | None] | None = None,
+) -> ServiceInfo:
+    return ServiceInfo(
+        HA_SERVICE_TYPE,
+        f"{instance}.{HA_SERVICE_TYPE}",
+        addresses=[socket.inet_aton(ip)],
+        port=port,
+        properties=properties or {},
+        server=server,
+    )
+
+
+def _discover(infos: list[ServiceInfo]) -> list[HAInstance]:
+    zc = FakeZeroconf(infos)
+    listener = _HAListener()
+    for info in infos:
+        listener.add_service(zc, HA_SERVICE_TYPE, info.name)  # type: ignore[arg-type]
+    return listener.instances
+
+
+def test_duplicate_uuid_announcements_collapse() -> None:
+    """Two announcements of the same HA uuid yield one instance; the latest wins."""
+    instances = _discover([
+        _service_info("Home", "192.168.1.10", properties={b"uuid": b"abc123"}),
+        _service_info("Home (2)", "192.168.1.11", properties={b"uuid": b"abc123"}),
+    ])
+    assert len(instances) == 1
+    assert instances[0].uuid == "abc123"
+    assert instances[0].ip == "192.168.1.11"
+    assert instances[0].url == "http://192.168.1.11:8123"
+
+
+def test_instances_without_uuid_keyed_by_host_and_port() -> None:
+    instances = _discover([
+        _service_info("Home", "192.168.1.10", server="ha-a.local."),
+        _service_info("Home", "192.168.1.10", server="ha-a.local."),
+        _service_info("Cabin", "192.168.1.20", server="ha-b.local."),
+    ])
+    assert sorted(i.host for i in instances) == ["ha-a.local.", "ha-b.local."]
+
+
+def test_txt_values_decoded() -> None:
+    """TXT values are decoded as UTF-8; undecodable bytes are replaced, missing keys are None."""
+    (instance,) = _discover([
+        _service_info("Home", "192.168.1.10", properties={
+            b"uuid": b"abc123",
+            b"version": b"2024.12.0",
+            b"location_name": b"Home \xff",
+        }),
+    ])
+    assert instance.version == "2024.12.0"
+    assert instance.location_name == "Home \ufffd"
+    assert instance.name == f"Home.{HA_SERVICE_TYPE}"
+
+    (instance,) = _discover([
+        _service_info("Home", "192.168.1.10", properties={
+            b"location_name": "Café".encode(),
+            b"version": None,
+        }),
+    ])
+    assert instance.location_name == "Café"
+    assert instance.version is None
+    assert instance.uuid is None
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import pytest
+
 from hass_atlas.energy import (
+    _merge_additions,
+    _show_topology_diff,
     apply_topology_prefs,
     build_energy_config,
     extract_energy_entity_ids,
@@ -12,28 +16,30 @@ from hass_atlas.energy import (
 )
 from hass_atlas.models import SpanDeviceTree
 from hass_atlas.topology import EnergyRole, EnergyTopology
+from tests.conftest import PANEL_DEVICE_ID, SERIAL, make_entity
 
 
 def test_build_energy_config_full(span_tree: SpanDeviceTree) -> None:
     """Full tree with site metering, solar, battery, circuits."""
     config = build_energy_config([span_tree])
 
-    sources = config["energy_sources"]
+    sources = {s["type"]: s for s in config["energy_sources"]}
     consumption = config["device_consumption"]
+    assert len(sources) == len(config["energy_sources"])  # one source per type
 
     # Grid source from site metering
-    grid = next(s for s in sources if s["type"] == "grid")
+    grid = sources["grid"]
     assert len(grid["flow_from"]) == 1
     assert grid["flow_from"][0]["stat_energy_from"] == "sensor.span_site_imported_energy"
     assert len(grid["flow_to"]) == 1
     assert grid["flow_to"][0]["stat_energy_to"] == "sensor.span_site_exported_energy"
 
     # Solar source
-    solar = next(s for s in sources if s["type"] == "solar")
+    solar = sources["solar"]
     assert solar["stat_energy_from"] == "sensor.span_solar_imported_energy"
 
     # Battery source
-    battery = next(s for s in sources if s["type"] == "battery")
+    battery = sources["battery"]
     assert battery["stat_energy_from"] == "sensor.span_battery_imported_energy"
     assert battery["stat_energy_to"] == "sensor.span_battery_exported_energy"
 
@@ -65,88 +71,129 @@ def test_build_energy_config_no_site_meter(span_tree: SpanDeviceTree) -> None:
     assert len(grid_sources) == 0
 
 
-def test_merge_prefs_empty_current() -> None:
-    """Merging into empty prefs should produce proposed config."""
-    proposed = {
-        "energy_sources": [
-            {"type": "grid", "flow_from": [{"stat_energy_from": "sensor.grid"}], "flow_to": []},
-        ],
-        "device_consumption": [
-            {"stat_consumption": "sensor.kitchen"},
-        ],
-    }
-    merged = merge_prefs({}, proposed)
-    assert len(merged["energy_sources"]) == 1
-    assert len(merged["device_consumption"]) == 1
+def test_build_energy_config_prefers_panel_upstream(span_tree: SpanDeviceTree) -> None:
+    """Panel lugs-upstream entities win over site metering; disabled ones are skipped."""
+    span_tree.panel.entities = [
+        make_entity(
+            "sensor.span_upstream_imported_energy_old",
+            f"{SERIAL}_lugs-upstream_imported-energy",
+            PANEL_DEVICE_ID,
+            disabled_by="user",
+        ),
+        make_entity(
+            "sensor.span_upstream_imported_energy",
+            f"{SERIAL}_lugs-upstream_imported-energy",
+            PANEL_DEVICE_ID,
+        ),
+    ]
+    config = build_energy_config([span_tree])
+    grid = next(s for s in config["energy_sources"] if s["type"] == "grid")
+    assert grid["flow_from"][0]["stat_energy_from"] == "sensor.span_upstream_imported_energy"
+    assert grid["flow_to"][0]["stat_energy_to"] == "sensor.span_site_exported_energy"
 
 
-def test_merge_prefs_no_duplicates() -> None:
-    """Don't add entries that already exist."""
-    current = {
-        "energy_sources": [
-            {"type": "grid", "flow_from": [{"stat_energy_from": "sensor.grid"}], "flow_to": []},
-        ],
-        "device_consumption": [
-            {"stat_consumption": "sensor.kitchen"},
-        ],
-    }
-    proposed = {
-        "energy_sources": [
-            {"type": "grid", "flow_from": [{"stat_energy_from": "sensor.grid"}], "flow_to": []},
-            {"type": "solar", "stat_energy_from": "sensor.solar"},
-        ],
-        "device_consumption": [
-            {"stat_consumption": "sensor.kitchen"},
-            {"stat_consumption": "sensor.garage"},
-        ],
-    }
+_GRID_SOURCE = {"type": "grid", "flow_from": [{"stat_energy_from": "sensor.grid"}], "flow_to": []}
+_SOLAR_SOURCE = {"type": "solar", "stat_energy_from": "sensor.solar"}
+_GAS_SOURCE = {"type": "gas", "stat_energy_from": "sensor.gas_meter"}
+
+
+@pytest.mark.parametrize(
+    "current, proposed, expected_types, expected_consumption",
+    [
+        # Merging into empty prefs should produce proposed config.
+        pytest.param(
+            {},
+            {
+                "energy_sources": [_GRID_SOURCE],
+                "device_consumption": [{"stat_consumption": "sensor.kitchen"}],
+            },
+            ["grid"],
+            ["sensor.kitchen"],
+            id="empty_current",
+        ),
+        # Don't add entries that already exist.
+        pytest.param(
+            {
+                "energy_sources": [_GRID_SOURCE],
+                "device_consumption": [{"stat_consumption": "sensor.kitchen"}],
+            },
+            {
+                "energy_sources": [_GRID_SOURCE, _SOLAR_SOURCE],
+                "device_consumption": [
+                    {"stat_consumption": "sensor.kitchen"},
+                    {"stat_consumption": "sensor.garage"},
+                ],
+            },
+            ["grid", "solar"],
+            ["sensor.kitchen", "sensor.garage"],
+            id="no_duplicates",
+        ),
+        # User-configured sources (gas, water) should not be removed.
+        pytest.param(
+            {"energy_sources": [_GAS_SOURCE], "device_consumption": []},
+            {
+                "energy_sources": [_GRID_SOURCE],
+                "device_consumption": [{"stat_consumption": "sensor.kitchen"}],
+            },
+            ["gas", "grid"],
+            ["sensor.kitchen"],
+            id="preserves_user_config",
+        ),
+    ],
+)
+def test_merge_prefs(
+    current: dict,
+    proposed: dict,
+    expected_types: list[str],
+    expected_consumption: list[str],
+) -> None:
     merged = merge_prefs(current, proposed)
-    assert len(merged["energy_sources"]) == 2  # grid (existing) + solar (new)
-    assert len(merged["device_consumption"]) == 2  # kitchen (existing) + garage (new)
+    assert [s["type"] for s in merged["energy_sources"]] == expected_types
+    assert [c["stat_consumption"] for c in merged["device_consumption"]] == expected_consumption
 
 
-def test_merge_prefs_preserves_user_config() -> None:
-    """User-configured sources (gas, water) should not be removed."""
+def test_merge_prefs_deep_copy() -> None:
+    """Merging should not mutate the current prefs dict."""
     current = {
         "energy_sources": [
-            {"type": "gas", "stat_energy_from": "sensor.gas_meter"},
+            {"type": "grid", "flow_from": [{"stat_energy_from": "sensor.grid"}], "flow_to": []},
         ],
         "device_consumption": [],
     }
     proposed = {
         "energy_sources": [
-            {"type": "grid", "flow_from": [{"stat_energy_from": "sensor.grid"}], "flow_to": []},
+            {"type": "solar", "stat_energy_from": "sensor.solar"},
         ],
         "device_consumption": [
             {"stat_consumption": "sensor.kitchen"},
         ],
     }
-    merged = merge_prefs(current, proposed)
-    source_types = {s["type"] for s in merged["energy_sources"]}
-    assert "gas" in source_types  # preserved
-    assert "grid" in source_types  # added
-    assert len(merged["device_consumption"]) == 1
+    original_len = len(current["energy_sources"])
+    merge_prefs(current, proposed)
+    assert len(current["energy_sources"]) == original_len  # not mutated
 
 
-def test_merge_prefs_deep_copy() -> None:
-    """Merging should not mutate the current prefs dict."""
+def test_merge_additions_reports_added_entries() -> None:
+    """Only entries not already present are reported as added."""
     current = {
         "energy_sources": [
             {"type": "grid", "flow_from": [{"stat_energy_from": "sensor.grid"}], "flow_to": []},
         ],
-        "device_consumption": [],
+        "device_consumption": [{"stat_consumption": "sensor.kitchen"}],
     }
+    solar = {"type": "solar", "stat_energy_from": "sensor.solar"}
+    garage = {"stat_consumption": "sensor.garage"}
     proposed = {
         "energy_sources": [
-            {"type": "solar", "stat_energy_from": "sensor.solar"},
-        ],
-        "device_consumption": [
-            {"stat_consumption": "sensor.kitchen"},
+            {"type": "grid", "flow_from": [{"stat_energy_from": "sensor.grid"}], "flow_to": []},
+            solar,
         ],
+        "device_consumption": [{"stat_consumption": "sensor.kitchen"}, garage],
     }
-    original_len = len(current["energy_sources"])
-    merge_prefs(current, proposed)
-    assert len(current["energy_sources"]) == original_len  # not mutated
+    merged, added_sources, added_consumption = _merge_additions(current, proposed)
+    assert added_sources == [solar]
+    assert added_consumption == [garage]
+    assert merged == merge_prefs(current, proposed)
 
 
 # ---------------------------------------------------------------------------
@@ -339,6 +386,23 @@ def test_remove_stale_does_not_mutate_original() -> None:
     assert len(cleaned["device_consumption"]) == 1
 
 
+def test_remove_stale_keeps_untouched_sources() -> None:
+    """Sources without stale references are kept exactly as they were."""
+    grid = {"type": "grid", "flow_from": [{"stat_energy_from": "sensor.grid"}], "flow_to": []}
+    battery = {
+        "type": "battery",
+        "stat_energy_from": "sensor.batt_out",
+        "stat_energy_to": "sensor.dead_batt_in",
+    }
+    prefs = {"energy_sources": [grid, battery], "device_consumption": []}
+    cleaned = remove_stale_references(prefs, {"sensor.dead_batt_in"})
+    assert cleaned["energy_sources"] == [
+        {"type": "grid", "flow_from": [{"stat_energy_from": "sensor.grid"}], "flow_to": []},
+        {"type": "battery", "stat_energy_from": "sensor.batt_out"},
+    ]
+    assert battery["stat_energy_to"] == "sensor.dead_batt_in"  # original not mutated
+
+
 # ---------------------------------------------------------------------------
 # apply_topology_prefs
 # ---------------------------------------------------------------------------
@@ -516,6 +580,32 @@ def test_apply_topology_does_not_mutate_current() -> None:
     assert len(current["device_consumption"]) == original_con_len
 
 
+def test_apply_topology_does_not_mutate_updated_entries() -> None:
+    """Entries that receive new stat_rate / included_in_stat are copied, not edited."""
+    current = {
+        "energy_sources": [
+            {"type": "solar", "stat_energy_from": "sensor.pv_energy"},
+        ],
+        "device_consumption": [
+            {"stat_consumption": "sensor.kitchen_energy"},
+        ],
+    }
+    topo = _make_topo(
+        preferred=[
+            EnergyRole("solar", "sensor.pv_energy", "span_ebus", True,
+                       "ok", rate_entity_id="sensor.pv_power"),
+            EnergyRole("device_consumption", "sensor.kitchen_energy", "span_ebus", True,
+                       "ok", parent_entity_id="sensor.panel_energy",
+                       rate_entity_id="sensor.kitchen_power"),
+        ],
+    )
+    result = apply_topology_prefs(current, topo)
+    assert result["energy_sources"][0]["stat_rate"] == "sensor.pv_power"
+    assert result["device_consumption"][0]["included_in_stat"] == "sensor.panel_energy"
+    assert current["energy_sources"][0] == {"type": "solar", "stat_energy_from": "sensor.pv_energy"}
+    assert current["device_consumption"][0] == {"stat_consumption": "sensor.kitchen_energy"}
+
+
 def test_apply_topology_preserves_extra_keys() -> None:
     """Extra top-level keys like device_consumption_water are preserved."""
     current = {
@@ -528,6 +618,21 @@ def test_apply_topology_preserves_extra_keys() -> None:
     assert result["device_consumption_water"] == [{"stat_consumption": "sensor.water"}]
 
 
+def test_apply_topology_empty_topology_keeps_everything() -> None:
+    """With no role assignments, all entries are kept in new lists."""
+    current = {
+        "energy_sources": [
+            {"type": "grid", "flow_from": [{"stat_energy_from": "sensor.grid"}], "flow_to": []},
+            {"type": "gas", "stat_energy_from": "sensor.gas_meter"},
+        ],
+        "device_consumption": [{"stat_consumption": "sensor.kitchen"}],
+    }
+    result = apply_topology_prefs(current, _make_topo())
+    assert result == current
+    assert result["energy_sources"] is not current["energy_sources"]
+    assert result["device_consumption"] is not current["device_consumption"]
+
+
 # ---------------------------------------------------------------------------
 # included_in_stat (Sankey hierarchy)
 # ---------------------------------------------------------------------------
@@ -706,6 +811,31 @@ def test_apply_topology_preserves_user_stat_rate() -> None:
     assert tasmota["stat_rate"] == "sensor.tasmota_power"
 
 
+def test_apply_topology_merges_fields_from_repeated_assignments() -> None:
+    """Parent and rate from separate assignments of one entity both apply."""
+    topo = _make_topo(preferred=[
+        EnergyRole("device_consumption", "sensor.kitchen_energy", "span_ebus", True,
+                   "ok", parent_entity_id="sensor.panel_energy"),
+        EnergyRole("device_consumption", "sensor.kitchen_energy", "span_ebus", True,
+                   "ok", rate_entity_id="sensor.kitchen_power"),
+    ])
+    expected = {
+        "stat_consumption": "sensor.kitchen_energy",
+        "included_in_stat": "sensor.panel_energy",
+        "stat_rate": "sensor.kitchen_power",
+    }
+    # New entry
+    result = apply_topology_prefs({"energy_sources": [], "device_consumption": []}, topo)
+    assert result["device_consumption"] == [expected]
+    # Existing entry
+    current = {
+        "energy_sources": [],
+        "device_consumption": [{"stat_consumption": "sensor.kitchen_energy"}],
+    }
+    result = apply_topology_prefs(current, topo)
+    assert result["device_consumption"] == [expected]
+
+
 def test_apply_topology_new_entries_get_stat_rate() -> None:
     """Newly added consumption entries include stat_rate."""
     current = {
@@ -834,3 +964,70 @@ def test_apply_topology_preserves_source_stat_rate_when_same() -> None:
     assert solar["stat_rate"] == "sensor.pv_generation_power"
     # Original not mutated
     assert current["energy_sources"][0]["stat_rate"] == "sensor.pv_generation_power"
+
+
+# ---------------------------------------------------------------------------
+# _show_topology_diff
+# ---------------------------------------------------------------------------
+
+
+def test_show_topology_diff_output(capsys: pytest.CaptureFixture[str]) -> None:
+    """Added, removed and updated sources/consumption are listed in a stable order."""
+    battery = {
+        "type": "battery", "stat_energy_from": "sensor.b_out", "stat_energy_to": "sensor.b_in",
+    }
+    current = {
+        "energy_sources": [
+            {"type": "grid", "flow_from": [{"stat_energy_from": "sensor.imp"}],
+             "flow_to": [{"stat_energy_to": "sensor.exp"}], "stat_rate": "sensor.gw_old"},
+            {"type": "solar", "stat_energy_from": "sensor.old_solar"},
+            battery,
+        ],
+        "device_consumption": [
+            {"stat_consumption": "sensor.kitchen", "included_in_stat": "sensor.panel",
+             "stat_rate": "sensor.kw_old"},
+            {"stat_consumption": "sensor.garage"},
+            {"stat_consumption": "sensor.old_circuit"},
+        ],
+    }
+    cleaned = {
+        "energy_sources": [
+            {"type": "grid", "flow_from": [{"stat_energy_from": "sensor.imp"}],
+             "flow_to": [{"stat_energy_to": "sensor.exp"}], "stat_rate": "sensor.gw"},
+            battery,
+            {"type": "solar", "stat_energy_from": "sensor.new_solar"},
+        ],
+        "device_consumption": [
+            {"stat_consumption": "sensor.kitchen", "included_in_stat": "sensor.panel",
+             "stat_rate": "sensor.kw"},
+            {"stat_consumption": "sensor.garage", "included_in_stat": "sensor.panel"},
+            {"stat_consumption": "sensor.dryer"},
+        ],
+    }
+    _show_topology_diff(current, cleaned)
+    lines = capsys.readouterr().out.splitlines()
+    assert "Energy Dashboard Changes" in lines[0]
+    assert lines[1:] == [
+        "INFO Removing 1 device consumption entry/ies:",
+        "  - sensor.old_circuit",
+        "INFO Adding 1 device consumption entry/ies:",
+        "  + sensor.dryer",
+        "INFO Updating 2 device consumption entry/ies:",
+        "  ~ sensor.garage: included_in_stat (none) → sensor.panel",
+        "  ~ sensor.kitchen: stat_rate sensor.kw_old → sensor.kw",
+        "INFO Updating 1 energy source(s):",
+        "  ~ grid:sensor.imp:sensor.exp: stat_rate sensor.gw_old → sensor.gw",
+        "INFO Removing energy source entity/ies:",
+        "  - sensor.old_solar",
+        "INFO Adding energy source entity/ies:",
+        "  + sensor.new_solar",
+    ]
+
+
+def test_show_topology_diff_no_changes(capsys: pytest.CaptureFixture[str]) -> None:
+    prefs = {
+        "energy_sources": [{"type": "solar", "stat_energy_from": "sensor.solar"}],
+        "device_consumption": [{"stat_consumption": "sensor.kitchen"}],
+    }
+    _show_topology_diff(prefs, dict(prefs))
+    assert "No changes needed" in capsys.readouterr().out
@@ -2,28 +2,44 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 from unittest.mock import AsyncMock, patch
 
 import pytest
+import websockets
 
 from hass_atlas.ha_client import HAClient, HAClientError
 
 
 class FakeWebSocket:
-    """Fake WebSocket connection for testing."""
+    """Fake WebSocket connection for testing.
 
-    def __init__(self, messages: list[str]) -> None:
+    Like a real server, a reply only becomes readable once the client has
+    sent something: the first message is ready on connect and each send()
+    releases the next one.  An exception in place of a message is raised
+    from recv(), e.g. to simulate the connection closing.
+    """
+
+    def __init__(self, messages: list[str | Exception]) -> None:
         self._messages = list(messages)
+        self._ready: asyncio.Queue[str | Exception] = asyncio.Queue()
         self._sent: list[str] = []
+        self._release()
+
+    def _release(self) -> None:
+        if self._messages:
+            self._ready.put_nowait(self._messages.pop(0))
 
     async def recv(self) -> str:
-        if not self._messages:
-            raise RuntimeError("No more messages")
-        return self._messages.pop(0)
+        message = await self._ready.get()
+        if isinstance(message, Exception):
+            raise message
+        return message
 
     async def send(self, data: str) -> None:
         self._sent.append(data)
+        self._release()
 
     async def close(self) -> None:
         pass
@@ -145,3 +161,56 @@ async def test_auto_increment_ids() -> None:
             sent2 = json.loads(ws._sent[2])
             assert sent1["id"] == 1
             assert sent2["id"] == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_commands_out_of_order_responses() -> None:
+    ws = FakeWebSocket([
+        json.dumps({"type": "auth_required"}),
+        json.dumps({"type": "auth_ok"}),
+        json.dumps({"id": 2, "type": "result", "success": True, "result": ["entities"]}),
+        json.dumps({"id": 1, "type": "result", "success": True, "result": ["devices"]}),
+    ])
+    with patch("hass_atlas.ha_client.websockets") as mock_ws:
+        mock_ws.connect = AsyncMock(return_value=ws)
+        async with HAClient("http://ha.local:8123", "token") as client:
+            devices, entities = await asyncio.gather(
+                client.send_command("config/device_registry/list"),
+                client.send_command("config/entity_registry/list"),
+            )
+            assert devices == ["devices"]
+            assert entities == ["entities"]
+
+
+@pytest.mark.asyncio
+async def test_connection_closed_fails_in_flight_command() -> None:
+    ws = FakeWebSocket([
+        json.dumps({"type": "auth_required"}),
+        json.dumps({"type": "auth_ok"}),
+        websockets.exceptions.ConnectionClosed(None, None),
+    ])
+    with patch("hass_atlas.ha_client.websockets") as mock_ws:
+        mock_ws.connect = AsyncMock(return_value=ws)
+        mock_ws.exceptions = websockets.exceptions
+        async with HAClient("http://ha.local:8123", "token") as client:
+            with pytest.raises(HAClientError, match="Connection lost during"):
+                await client.send_command("config/device_registry/list")
+
+
+@pytest.mark.asyncio
+async def test_connection_closed_fails_later_commands_fast() -> None:
+    ws = FakeWebSocket([
+        json.dumps({"type": "auth_required"}),
+        json.dumps({"type": "auth_ok"}),
+        websockets.exceptions.ConnectionClosed(None, None),
+    ])
+    with patch("hass_atlas.ha_client.websockets") as mock_ws:
+        mock_ws.connect = AsyncMock(return_value=ws)
+        mock_ws.exceptions = websockets.exceptions
+        async with HAClient("http://ha.local:8123", "token") as client:
+            ws._release()  # server closes with nothing in flight
+            assert client._reader is not None
+            await client._reader
+            with pytest.raises(HAClientError, match="Connection lost before"):
+                await client.send_command("config/device_registry/list")
+            assert len(ws._sent) == 1  # only the auth frame
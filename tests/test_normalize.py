@@ -42,7 +42,7 @@ def _make_device(name: str, name_by_user: str | None = None) -> HADevice:
         name=name,
         name_by_user=name_by_user,
         model="Circuit",
-        identifiers=[("span_ebus", "serial_node")],
+        identifiers=(("span_ebus", "serial_node"),),
     )
 
 
@@ -91,7 +91,7 @@ def _make_tree(devices: list[HADevice]) -> SpanDeviceTree:
         id="dev-panel",
         name="SPAN Panel",
         model="SPAN Panel",
-        identifiers=[("span_ebus", "serial")],
+        identifiers=(("span_ebus", "serial"),),
         children=devices,
     )
     return SpanDeviceTree(panel=panel, circuits=devices)
@@ -153,7 +153,7 @@ def test_compute_renames_collision_vacated() -> None:
         id="dev-002",
         name="Garage",
         model="Circuit",
-        identifiers=[("span_ebus", "serial_node2")],
+        identifiers=(("span_ebus", "serial_node2"),),
     )
     device2.entities = [
         _make_entity("sensor.kitchen_power", original_name="Power", device_id="dev-002"),
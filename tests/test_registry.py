@@ -15,18 +15,19 @@ from tests.conftest import (
     PANEL_DEVICE_ID,
     SERIAL,
     SITE_METER_DEVICE_ID,
+    RawRows,
 )
 
 
-def test_parse_device(raw_devices: list[dict]) -> None:
+def test_parse_device(raw_devices: RawRows) -> None:
     device = _parse_device(raw_devices[0])
     assert device.id == PANEL_DEVICE_ID
     assert device.name == "SPAN Panel"
-    assert device.identifiers == [("span_ebus", SERIAL)]
+    assert device.identifiers == (("span_ebus", SERIAL),)
     assert device.via_device_id is None
 
 
-def test_parse_entity(raw_entities: list[dict]) -> None:
+def test_parse_entity(raw_entities: RawRows) -> None:
     entity = _parse_entity(raw_entities[0])
     assert entity.entity_id == "sensor.span_site_imported_energy"
     assert entity.platform == "span_ebus"
@@ -34,20 +35,20 @@ def test_parse_entity(raw_entities: list[dict]) -> None:
     assert entity.state_class == "total_increasing"
 
 
-def test_parse_area(raw_areas: list[dict]) -> None:
+def test_parse_area(raw_areas: RawRows) -> None:
     area = _parse_area(raw_areas[0])
     assert area.area_id == "area-kitchen"
     assert area.name == "Kitchen"
 
 
-def test_is_span_device(raw_devices: list[dict]) -> None:
+def test_is_span_device(raw_devices: RawRows) -> None:
     span_dev = _parse_device(raw_devices[0])
     other_dev = _parse_device(raw_devices[4])  # Hue device
     assert _is_span_device(span_dev) is True
     assert _is_span_device(other_dev) is False
 
 
-def test_build_trees(raw_devices: list[dict], raw_entities: list[dict]) -> None:
+def test_build_trees(raw_devices: RawRows, raw_entities: RawRows) -> None:
     devices = [_parse_device(d) for d in raw_devices]
     entities = [_parse_entity(e) for e in raw_entities if e["platform"] == "span_ebus"]
     trees = _build_trees(devices, entities)
@@ -88,7 +89,7 @@ def test_build_trees_no_span_devices() -> None:
     assert trees == []
 
 
-def test_circuit_area_preserved(raw_devices: list[dict], raw_entities: list[dict]) -> None:
+def test_circuit_area_preserved(raw_devices: RawRows, raw_entities: RawRows) -> None:
     """Verify area_id from registry is preserved on parsed devices."""
     devices = [_parse_device(d) for d in raw_devices]
     entities = [_parse_entity(e) for e in raw_entities if e["platform"] == "span_ebus"]
@@ -98,3 +99,17 @@ def test_circuit_area_preserved(raw_devices: list[dict], raw_entities: list[dict
     garage = next(c for c in trees[0].circuits if c.id == CIRCUIT_2_DEVICE_ID)
     assert kitchen.area_id == "area-kitchen"
     assert garage.area_id is None
+
+
+def test_build_trees_filters_non_span_entities(
+    raw_devices: RawRows, raw_entities: RawRows,
+) -> None:
+    """Passing the full entity registry attaches only span_ebus entities."""
+    devices = [_parse_device(d) for d in raw_devices]
+    entities = [_parse_entity(e) for e in raw_entities]
+    assert any(e.platform != "span_ebus" for e in entities)
+    trees = _build_trees(devices, entities)
+
+    for device in [trees[0].panel, trees[0].site_metering] + trees[0].circuits:
+        for entity in device.entities:
+            assert entity.platform == "span_ebus"
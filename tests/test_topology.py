@@ -64,7 +64,7 @@ def test_discover_energy_integrations_multi_platform(
 
 def test_discover_energy_integrations_no_energy_entities() -> None:
     """No energy entities found at all."""
-    devices = [HADevice(id="d1", name="Hue", identifiers=[("hue", "123")])]
+    devices = [HADevice(id="d1", name="Hue", identifiers=(("hue", "123"),))]
     entities = [HAEntity(
         entity_id="light.hue_1", unique_id="h1", platform="hue",
         device_id="d1", device_class=None, state_class=None,
@@ -123,14 +123,14 @@ def test_extract_span_topology_sub_panel() -> None:
         id="dev-sub-panel",
         name="Sub Panel",
         model="SPAN Panel",
-        identifiers=[("span_ebus", sub_serial)],
+        identifiers=(("span_ebus", sub_serial),),
         via_device_id="dev-main-panel",  # via another SPAN panel
     )
     batt = HADevice(
         id="dev-sub-batt",
         name="Battery Storage",
         model="Battery Storage",
-        identifiers=[("span_ebus", f"{sub_serial}_battery")],
+        identifiers=(("span_ebus", f"{sub_serial}_battery"),),
         via_device_id="dev-sub-panel",
         entities=[
             HAEntity(
@@ -145,7 +145,7 @@ def test_extract_span_topology_sub_panel() -> None:
         id="dev-sub-solar",
         name="Solar PV",
         model="Solar PV",
-        identifiers=[("span_ebus", f"{sub_serial}_solar")],
+        identifiers=(("span_ebus", f"{sub_serial}_solar"),),
         via_device_id="dev-sub-panel",
         entities=[
             HAEntity(
@@ -761,13 +761,13 @@ def test_circuit_node_id_extraction(circuit_devices: list[HADevice]) -> None:
 
 def test_circuit_node_id_no_underscore() -> None:
     """Device with no underscore in identifier returns None."""
-    device = HADevice(id="d1", name="X", identifiers=[("span_ebus", "just-a-serial")])
+    device = HADevice(id="d1", name="X", identifiers=(("span_ebus", "just-a-serial"),))
     assert _circuit_node_id(device) is None
 
 
 def test_circuit_node_id_non_span() -> None:
     """Non-span device returns None."""
-    device = HADevice(id="d1", name="X", identifiers=[("hue", "abc_def")])
+    device = HADevice(id="d1", name="X", identifiers=(("hue", "abc_def"),))
     assert _circuit_node_id(device) is None
 
 
@@ -940,14 +940,14 @@ def test_build_energy_topology_multi_panel_hierarchy(
         id="dev-sub-panel",
         name="Sub Panel",
         model="SPAN Panel",
-        identifiers=[("span_ebus", sub_serial)],
+        identifiers=(("span_ebus", sub_serial),),
         via_device_id=PANEL_DEVICE_ID,
     )
     sub_site_meter = HADevice(
         id="dev-sub-site-meter",
         name="Sub Site Metering",
         model="Site Metering",
-        identifiers=[("span_ebus", f"{sub_serial}_site-meter")],
+        identifiers=(("span_ebus", f"{sub_serial}_site-meter"),),
         via_device_id="dev-sub-panel",
         entities=[
             HAEntity(
@@ -961,7 +961,7 @@ def test_build_energy_topology_multi_panel_hierarchy(
         id="dev-sub-circuit-001",
         name="Sub Kitchen",
         model="Circuit",
-        identifiers=[("span_ebus", f"{sub_serial}_sc1-node")],
+        identifiers=(("span_ebus", f"{sub_serial}_sc1-node"),),
         via_device_id="dev-sub-panel",
         entities=[
             HAEntity(
@@ -1031,13 +1031,13 @@ def test_build_energy_topology_daisy_chain_hierarchy(
         id="dev-lead",
         name="Lead Panel",
         model="SPAN Panel",
-        identifiers=[("span_ebus", lead_serial)],
+        identifiers=(("span_ebus", lead_serial),),
     )
     lead_site_meter = HADevice(
         id="dev-lead-sm",
         name="Lead Site Metering",
         model="Site Metering",
-        identifiers=[("span_ebus", f"{lead_serial}_site-meter")],
+        identifiers=(("span_ebus", f"{lead_serial}_site-meter"),),
         via_device_id="dev-lead",
         entities=[
             HAEntity(
@@ -1051,7 +1051,7 @@ def test_build_energy_topology_daisy_chain_hierarchy(
         id="dev-lead-c1",
         name="Lead Kitchen",
         model="Circuit",
-        identifiers=[("span_ebus", f"{lead_serial}_lc1")],
+        identifiers=(("span_ebus", f"{lead_serial}_lc1"),),
         via_device_id="dev-lead",
         entities=[
             HAEntity(
@@ -1070,14 +1070,14 @@ def test_build_energy_topology_daisy_chain_hierarchy(
         id="dev-mid",
         name="Mid Panel",
         model="SPAN Panel",
-        identifiers=[("span_ebus", mid_serial)],
+        identifiers=(("span_ebus", mid_serial),),
         via_device_id="dev-lead",
     )
     mid_site_meter = HADevice(
         id="dev-mid-sm",
         name="Mid Site Metering",
         model="Site Metering",
-        identifiers=[("span_ebus", f"{mid_serial}_site-meter")],
+        identifiers=(("span_ebus", f"{mid_serial}_site-meter"),),
         via_device_id="dev-mid",
         entities=[
             HAEntity(
@@ -1091,7 +1091,7 @@ def test_build_energy_topology_daisy_chain_hierarchy(
         id="dev-mid-c1",
         name="Mid Kitchen",
         model="Circuit",
-        identifiers=[("span_ebus", f"{mid_serial}_mc1")],
+        identifiers=(("span_ebus", f"{mid_serial}_mc1"),),
         via_device_id="dev-mid",
         entities=[
             HAEntity(
@@ -1110,14 +1110,14 @@ def test_build_energy_topology_daisy_chain_hierarchy(
         id="dev-tail",
         name="Tail Panel",
         model="SPAN Panel",
-        identifiers=[("span_ebus", tail_serial)],
+        identifiers=(("span_ebus", tail_serial),),
         via_device_id="dev-mid",
     )
     tail_site_meter = HADevice(
         id="dev-tail-sm",
         name="Tail Site Metering",
         model="Site Metering",
-        identifiers=[("span_ebus", f"{tail_serial}_site-meter")],
+        identifiers=(("span_ebus", f"{tail_serial}_site-meter"),),
         via_device_id="dev-tail",
         entities=[
             HAEntity(
@@ -1131,7 +1131,7 @@ def test_build_energy_topology_daisy_chain_hierarchy(
         id="dev-tail-c1",
         name="Tail Office",
         model="Circuit",
-        identifiers=[("span_ebus", f"{tail_serial}_tc1")],
+        identifiers=(("span_ebus", f"{tail_serial}_tc1"),),
         via_device_id="dev-tail",
         entities=[
             HAEntity(
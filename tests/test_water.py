@@ -0,0 +1,43 @@
+"""Tests for the water command logic."""
+
+from __future__ import annotations
+
+from hass_atlas.water import merge_water_prefs
+
+
+def test_merge_water_prefs_empty_current() -> None:
+    merged = merge_water_prefs({}, ["sensor.water_main"])
+    assert merged == {"device_consumption_water": [{"stat_consumption": "sensor.water_main"}]}
+
+
+def test_merge_water_prefs_appends_new_ids() -> None:
+    """New sensors are appended after existing entries, which are kept as-is."""
+    current = {
+        "energy_sources": [{"type": "grid"}],
+        "device_consumption_water": [
+            {"stat_consumption": "sensor.water_main", "name": "Main"},
+        ],
+    }
+    merged = merge_water_prefs(current, ["sensor.water_main", "sensor.water_garden"])
+    assert merged["device_consumption_water"] == [
+        {"stat_consumption": "sensor.water_main", "name": "Main"},
+        {"stat_consumption": "sensor.water_garden"},
+    ]
+    assert merged["energy_sources"] == [{"type": "grid"}]
+
+
+def test_merge_water_prefs_collapses_duplicate_ids() -> None:
+    merged = merge_water_prefs({}, ["sensor.water_main", "sensor.water_main"])
+    assert merged == {"device_consumption_water": [{"stat_consumption": "sensor.water_main"}]}
+
+
+def test_merge_water_prefs_does_not_mutate_current() -> None:
+    current = {"device_consumption_water": [{"stat_consumption": "sensor.water_main"}]}
+    merge_water_prefs(current, ["sensor.water_garden"])
+    assert current == {"device_consumption_water": [{"stat_consumption": "sensor.water_main"}]}
+
+
+def test_merge_water_prefs_returns_current_when_nothing_to_add() -> None:
+    current = {"device_consumption_water": [{"stat_consumption": "sensor.water_main"}]}
+    assert merge_water_prefs(current, ["sensor.water_main"]) is current
+    assert merge_water_prefs(current, []) is current